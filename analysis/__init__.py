@@ -0,0 +1 @@
+"""Quantitative helpers built on top of attention and hint maps."""
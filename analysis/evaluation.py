@@ -0,0 +1,378 @@
+"""Score attention maps against eye-tracking fixations over a local dataset.
+
+Each image is paired with a ground-truth file of the same stem in the
+fixation directory: a fixation map image (pixels above mid-gray are fixations,
+so JPEG ringing around the dots is ignored), a .npy array (an (N, 2) list of
+x, y points or a binary (H, W) fixation map; continuous density maps are
+rejected), or a .txt/.csv file with one "x, y" point per line. Points are in
+pixels of the upright original image.
+
+The core map and both hint maps are computed once per image; every hint
+setting is then derived with apply_hints and all settings are scored in one
+batched metric call. Images run on a process pool, and both the computed maps
+and the metric results are cached on disk keyed by file content, so repeat
+sweeps only pay for settings they have not seen.
+
+Usage:
+    python -m analysis.evaluation IMAGES FIXATIONS --setting 0.6,0.6,1.0 --setting 1.0,0.3,0.8
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import ExifTags, Image
+
+from analysis.saliency_metrics import compute_all
+from core_adapter.image_loader import load_image
+from phase3.hints.face_hint import build_face_hint_map
+from phase3.hints.text_hint import build_text_hint_map
+from phase3.runner import apply_hints
+
+_CACHE_VERSION = "3"
+_IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg")
+_FIXATION_SUFFIXES = (".png", ".jpg", ".jpeg", ".npy", ".txt", ".csv")
+METRIC_NAMES = ("auc_judd", "nss", "cc", "sim", "kl")
+CORE_LABEL = "core"
+_FIXATION_IMAGE_THRESHOLD = 127
+
+
+@dataclass(frozen=True)
+class HintSetting:
+    alpha: float
+    beta: float
+    blend: float = 1.0
+
+    @property
+    def label(self) -> str:
+        return f"a={self.alpha:g},b={self.beta:g},blend={self.blend:g}"
+
+
+@dataclass
+class ImageEvaluation:
+    name: str
+    metrics: Dict[str, Dict[str, float]]
+
+
+@dataclass
+class EvaluationReport:
+    images: List[ImageEvaluation] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Return the mean of each metric per setting, ignoring NaN entries."""
+        labels: List[str] = []
+        for image in self.images:
+            labels.extend(label for label in image.metrics if label not in labels)
+
+        summary: Dict[str, Dict[str, float]] = {}
+        for label in labels:
+            rows = [image.metrics[label] for image in self.images if label in image.metrics]
+            summary[label] = {
+                name: float(np.nanmean([row[name] for row in rows])) if rows else float("nan")
+                for name in METRIC_NAMES
+            }
+        return summary
+
+
+def discover_dataset(
+    image_dir: Path,
+    fixation_dir: Path,
+) -> Tuple[List[Tuple[Path, Path]], List[str]]:
+    """Pair each image with the fixation file sharing its stem."""
+    fixation_files: Dict[str, Path] = {}
+    for path in sorted(Path(fixation_dir).iterdir()):
+        if path.suffix.lower() in _FIXATION_SUFFIXES:
+            fixation_files.setdefault(path.stem, path)
+
+    pairs: List[Tuple[Path, Path]] = []
+    skipped: List[str] = []
+    for path in sorted(Path(image_dir).iterdir()):
+        if path.suffix.lower() not in _IMAGE_SUFFIXES:
+            continue
+        if path.stem in fixation_files:
+            pairs.append((path, fixation_files[path.stem]))
+        else:
+            skipped.append(path.name)
+    return pairs, skipped
+
+
+def evaluate_dataset(
+    image_dir: Path,
+    fixation_dir: Path,
+    settings: Sequence[HintSetting] = (),
+    include_core: bool = True,
+    max_side: Optional[int] = 1024,
+    sigma_fraction: float = 0.025,
+    workers: Optional[int] = None,
+    cache_dir: Optional[Path] = None,
+) -> EvaluationReport:
+    """Evaluate every image/fixation pair under each hint setting."""
+    pairs, skipped = discover_dataset(image_dir, fixation_dir)
+    report = EvaluationReport(skipped=skipped)
+    tasks = [
+        _ImageTask(
+            image_path=str(image_path),
+            fixation_path=str(fixation_path),
+            settings=tuple(settings),
+            include_core=include_core,
+            max_side=max_side,
+            sigma_fraction=sigma_fraction,
+            cache_dir=str(cache_dir) if cache_dir is not None else None,
+        )
+        for image_path, fixation_path in pairs
+    ]
+    report.images.extend(_run_tasks(tasks, workers))
+    return report
+
+
+@dataclass(frozen=True)
+class _ImageTask:
+    image_path: str
+    fixation_path: str
+    settings: Tuple[HintSetting, ...]
+    include_core: bool
+    max_side: Optional[int]
+    sigma_fraction: float
+    cache_dir: Optional[str]
+
+
+def _run_tasks(tasks: Sequence[_ImageTask], workers: Optional[int]) -> Iterator[ImageEvaluation]:
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield _evaluate_image(task)
+        return
+
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_evaluate_image, tasks, chunksize=chunksize)
+
+
+def _evaluate_image(task: _ImageTask) -> ImageEvaluation:
+    image_path = Path(task.image_path)
+    labels = ([CORE_LABEL] if task.include_core else []) + [s.label for s in task.settings]
+
+    image_key = _file_digest(image_path, extra=f"{task.max_side}")
+    results_key = _file_digest(Path(task.fixation_path), extra=f"{image_key}:{task.sigma_fraction}")
+    cached = _read_json(task.cache_dir, f"{results_key}.json")
+    missing = [label for label in labels if label not in cached]
+    if not missing:
+        return ImageEvaluation(image_path.name, {label: cached[label] for label in labels})
+
+    need_hints = any(setting.label in missing for setting in task.settings)
+    maps = _load_maps(task, image_key, need_hints)
+    core = maps["attention"]
+
+    stack: List[np.ndarray] = []
+    if CORE_LABEL in missing:
+        stack.append(np.asarray(core, dtype=np.float32))
+    for setting in task.settings:
+        if setting.label in missing:
+            stack.append(
+                apply_hints(
+                    core, maps["face"], maps["text"], setting.alpha, setting.beta, setting.blend
+                )
+            )
+
+    fixation_map, density_map = _load_ground_truth(
+        Path(task.fixation_path), image_path, core.shape, task.sigma_fraction
+    )
+    scores = compute_all(np.stack(stack), fixation_map, density_map)
+    for row, label in enumerate(missing):
+        cached[label] = {name: float(scores[name][row]) for name in METRIC_NAMES}
+
+    _write_json(task.cache_dir, f"{results_key}.json", cached)
+    return ImageEvaluation(image_path.name, {label: cached[label] for label in labels})
+
+
+def _load_maps(task: _ImageTask, image_key: str, need_hints: bool) -> Dict[str, np.ndarray]:
+    cache_path = _cache_path(task.cache_dir, f"{image_key}.npz")
+    maps: Dict[str, np.ndarray] = {}
+    if cache_path is not None and cache_path.is_file():
+        with np.load(cache_path) as stored:
+            maps = {name: stored[name] for name in stored.files}
+        if not need_hints or "face" in maps:
+            return maps
+
+    # Imported here so ground truth, metrics and cached maps work without core.
+    from core_adapter.attention_runner import run_attention
+
+    image = load_image(task.image_path, max_side=task.max_side)
+    if "attention" not in maps:
+        maps["attention"] = np.asarray(run_attention(image).attention_map, dtype=np.float32)
+    if need_hints:
+        image_array = np.asarray(image, dtype=np.float32)
+        maps["face"] = build_face_hint_map(image_array)
+        maps["text"] = build_text_hint_map(image_array)
+
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(cache_path, **maps)
+    return maps
+
+
+def _load_ground_truth(
+    fixation_path: Path,
+    image_path: Path,
+    shape: Tuple[int, int],
+    sigma_fraction: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    points, source_size = _read_fixation_points(fixation_path, image_path)
+    height, width = shape
+    fixation_map = np.zeros(shape, dtype=np.float64)
+    if len(points):
+        cols = np.clip((points[:, 0] * width / source_size[0]).astype(np.intp), 0, width - 1)
+        rows = np.clip((points[:, 1] * height / source_size[1]).astype(np.intp), 0, height - 1)
+        fixation_map[rows, cols] = 1.0
+    sigma = max(1.0, sigma_fraction * max(height, width))
+    return fixation_map, _gaussian_blur(fixation_map, sigma)
+
+
+def _read_fixation_points(
+    fixation_path: Path,
+    image_path: Path,
+) -> Tuple[np.ndarray, Tuple[int, int]]:
+    suffix = fixation_path.suffix.lower()
+    if suffix == ".npy":
+        data = np.load(fixation_path)
+        if data.ndim == 2 and data.shape[1] == 2:
+            return data.astype(np.float64), _upright_size(image_path)
+        levels = np.unique(data)
+        if len(levels) > 2 or (len(levels) == 2 and levels[0] != 0):
+            raise ValueError(
+                f"{fixation_path.name}: (H, W) fixation maps must be binary; "
+                "a continuous density map does not mark individual fixations"
+            )
+        return _map_to_points(data > 0)
+    if suffix in (".txt", ".csv"):
+        text = fixation_path.read_text().replace(",", " ")
+        rows = [line.split() for line in text.splitlines() if line.strip()]
+        data = np.array(rows, dtype=np.float64).reshape(-1, 2)
+        return data, _upright_size(image_path)
+    with Image.open(fixation_path) as fixation_image:
+        gray = np.asarray(fixation_image.convert("L"))
+    # Mid-level threshold: lossy formats smear faint non-zero halos around
+    # each fixation dot that a "> 0" test would count as fixations.
+    return _map_to_points(gray > _FIXATION_IMAGE_THRESHOLD)
+
+
+def _map_to_points(fixation_map: np.ndarray) -> Tuple[np.ndarray, Tuple[int, int]]:
+    rows, cols = np.nonzero(fixation_map)
+    # Pixel centers, so rescaling onto a smaller grid rounds to the right cell.
+    points = np.stack([cols + 0.5, rows + 0.5], axis=1).astype(np.float64)
+    return points, (fixation_map.shape[1], fixation_map.shape[0])
+
+
+def _upright_size(image_path: Path) -> Tuple[int, int]:
+    with Image.open(image_path) as image:
+        width, height = image.size
+        orientation = image.getexif().get(ExifTags.Base.Orientation, 1)
+    if orientation in (5, 6, 7, 8):
+        return height, width
+    return width, height
+
+
+def _gaussian_blur(values: np.ndarray, sigma: float) -> np.ndarray:
+    # Separable blur with a kernel truncated at 3 sigma and zero padding at the
+    # borders. Each axis is an FFT convolution, so cost stays O(HW log) at any
+    # resolution and avoids an OpenCV or SciPy dependency for the harness.
+    radius = max(1, int(np.ceil(3.0 * sigma)))
+    offsets = np.arange(-radius, radius + 1, dtype=np.float64)
+    kernel = np.exp(-0.5 * (offsets / sigma) ** 2)
+    blurred = _convolve_axis(values, kernel, axis=0)
+    blurred = _convolve_axis(blurred, kernel, axis=1)
+    # FFT round-off leaves values around -1e-15 far from any fixation.
+    return np.maximum(blurred, 0.0, out=blurred)
+
+
+def _convolve_axis(values: np.ndarray, kernel: np.ndarray, axis: int) -> np.ndarray:
+    size = values.shape[axis]
+    length = size + len(kernel) - 1
+    spectrum = np.fft.rfft(values, n=length, axis=axis)
+    shape = [1, 1]
+    shape[axis] = -1
+    spectrum *= np.fft.rfft(kernel, n=length).reshape(shape)
+    full = np.fft.irfft(spectrum, n=length, axis=axis)
+    radius = (len(kernel) - 1) // 2
+    return np.take(full, np.arange(radius, radius + size), axis=axis)
+
+
+def _file_digest(path: Path, extra: str = "") -> str:
+    digest = hashlib.sha1(f"{_CACHE_VERSION}:{extra}:".encode("utf-8"))
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_path(cache_dir: Optional[str], name: str) -> Optional[Path]:
+    return None if cache_dir is None else Path(cache_dir) / name
+
+
+def _read_json(cache_dir: Optional[str], name: str) -> Dict[str, Dict[str, float]]:
+    path = _cache_path(cache_dir, name)
+    if path is None or not path.is_file():
+        return {}
+    try:
+        return json.loads(path.read_text())
+    except ValueError:
+        return {}
+
+
+def _write_json(cache_dir: Optional[str], name: str, payload: Dict[str, Dict[str, float]]) -> None:
+    path = _cache_path(cache_dir, name)
+    if path is None:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(payload, sort_keys=True))
+    os.replace(tmp_path, path)
+
+
+def _parse_setting(text: str) -> HintSetting:
+    parts = [float(part) for part in text.split(",")]
+    if len(parts) not in (2, 3):
+        raise argparse.ArgumentTypeError("settings are 'alpha,beta' or 'alpha,beta,blend'")
+    return HintSetting(*parts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("images", type=Path)
+    parser.add_argument("fixations", type=Path)
+    parser.add_argument("--setting", action="append", type=_parse_setting, default=[])
+    parser.add_argument("--no-core", action="store_true", help="skip the core-only baseline")
+    parser.add_argument("--max-side", type=int, default=1024)
+    parser.add_argument("--sigma-fraction", type=float, default=0.025)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache-dir", type=Path, default=Path(".eval_cache"))
+    args = parser.parse_args()
+
+    report = evaluate_dataset(
+        args.images,
+        args.fixations,
+        settings=args.setting,
+        include_core=not args.no_core,
+        max_side=args.max_side,
+        sigma_fraction=args.sigma_fraction,
+        workers=args.workers,
+        cache_dir=args.cache_dir,
+    )
+
+    print(f"{len(report.images)} images scored, {len(report.skipped)} without fixations")
+    print(f"{'setting':<28}" + "".join(f"{name:>10}" for name in METRIC_NAMES))
+    for label, metrics in report.summary().items():
+        print(f"{label:<28}" + "".join(f"{metrics[name]:>10.3f}" for name in METRIC_NAMES))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from core_adapter.attention_runner import AttentionResult
+
+Box = Tuple[int, int, int, int]
+
+
+@dataclass
+class Hotspot:
+    box: Box
+    mass: float
+    share: float
+
+
+class RegionIndex:
+    """Summed-area table over a 2D map for constant-time region queries.
+
+    Boxes are (x0, y0, x1, y1) with exclusive ends, the same convention the
+    Phase 3 hint builders use. If image_size=(width, height) is given, boxes
+    and polygons are in image pixels and are rescaled onto the map grid.
+    """
+
+    def __init__(
+        self,
+        attention_map: np.ndarray,
+        image_size: Optional[Tuple[int, int]] = None,
+    ) -> None:
+        values = np.asarray(attention_map, dtype=np.float64)
+        if values.ndim == 3:
+            values = values.mean(axis=2)
+        if values.ndim != 2:
+            raise ValueError("attention_map must be a 2D (H, W) array")
+
+        self.height, self.width = values.shape
+        if image_size is None:
+            self._scale_x = 1.0
+            self._scale_y = 1.0
+        else:
+            self._scale_x = self.width / float(image_size[0])
+            self._scale_y = self.height / float(image_size[1])
+
+        self._table = np.zeros((self.height + 1, self.width + 1), dtype=np.float64)
+        np.cumsum(values, axis=0, out=self._table[1:, 1:])
+        np.cumsum(self._table[1:, 1:], axis=1, out=self._table[1:, 1:])
+        self.total = float(self._table[-1, -1])
+
+    def box_mass(self, box: Sequence[float]) -> float:
+        """Return the summed map value inside one box."""
+        return float(self.box_masses([box])[0])
+
+    def box_masses(self, boxes: Sequence[Sequence[float]]) -> np.ndarray:
+        """Return the summed map value inside each of N boxes as an (N,) array."""
+        x0, y0, x1, y1 = self._to_grid(boxes)
+        table = self._table
+        return table[y1, x1] - table[y0, x1] - table[y1, x0] + table[y0, x0]
+
+    def box_shares(self, boxes: Sequence[Sequence[float]]) -> np.ndarray:
+        """Return each box's fraction of the total map mass."""
+        masses = self.box_masses(boxes)
+        if self.total <= 0.0:
+            return np.zeros_like(masses)
+        return masses / self.total
+
+    def polygon_mass(self, vertices: Sequence[Sequence[float]]) -> float:
+        """Return the summed map value over pixels whose centers lie inside a polygon.
+
+        Each covered row is split into spans by an even-odd scanline, and every
+        span is read from the table in O(1), so cost grows with the polygon's
+        height rather than its area.
+        """
+        points = np.asarray(vertices, dtype=np.float64).reshape(-1, 2)
+        if len(points) < 3:
+            raise ValueError("a polygon needs at least 3 vertices")
+
+        xs = points[:, 0] * self._scale_x
+        ys = points[:, 1] * self._scale_y
+        row0 = max(0, int(np.floor(ys.min())))
+        row1 = min(self.height, int(np.ceil(ys.max())))
+        if row1 <= row0:
+            return 0.0
+
+        rows = np.arange(row0, row1)
+        centers = (rows + 0.5)[:, None]
+        xa, ya = xs[None, :], ys[None, :]
+        xb, yb = np.roll(xs, -1)[None, :], np.roll(ys, -1)[None, :]
+
+        crosses = (ya <= centers) != (yb <= centers)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cross_x = xa + (centers - ya) * (xb - xa) / (yb - ya)
+        cross_x = np.where(crosses, cross_x, np.inf)
+        cross_x.sort(axis=1)
+        cross_x = cross_x[:, : int(crosses.sum(axis=1).max())]
+
+        starts = _pixel_column(cross_x[:, 0::2], self.width)
+        ends = np.maximum(_pixel_column(cross_x[:, 1::2], self.width), starts)
+
+        return self._span_mass(rows[:, None], starts, ends)
+
+    def mask_mass(self, mask: np.ndarray) -> float:
+        """Return the summed map value under a boolean mask on the map grid.
+
+        The mask is run-length encoded row by row inside its bounding box and
+        each run is read from the table like a polygon span.
+        """
+        mask = np.asarray(mask, dtype=bool)
+        if mask.shape != (self.height, self.width):
+            raise ValueError("mask must match the indexed map shape")
+        rows = np.flatnonzero(mask.any(axis=1))
+        if rows.size == 0:
+            return 0.0
+        cols = np.flatnonzero(mask.any(axis=0))
+        row0, col0 = rows[0], cols[0]
+        inside = mask[row0:rows[-1] + 1, col0:cols[-1] + 1]
+
+        padded = np.zeros((inside.shape[0], inside.shape[1] + 2), dtype=np.int8)
+        padded[:, 1:-1] = inside
+        edges = np.diff(padded, axis=1)
+        # nonzero is row-major, so the k-th run start and run end share a row.
+        run_rows, starts = np.nonzero(edges == 1)
+        _, ends = np.nonzero(edges == -1)
+        return self._span_mass(run_rows + row0, starts + col0, ends + col0)
+
+    def hotspots(self, top_k: int = 5, window: Optional[int] = None) -> List[Hotspot]:
+        """Return up to top_k non-overlapping windows holding the most mass.
+
+        Window sums for every position come from the table in one vectorized
+        pass; peaks are then taken greedily, suppressing overlapping windows.
+        """
+        if self.height == 0 or self.width == 0:
+            return []
+        if window is None:
+            window = max(1, min(self.height, self.width) // 10)
+        window = int(min(max(1, window), self.height, self.width))
+
+        table = self._table
+        sums = (
+            table[window:, window:] - table[:-window, window:]
+            - table[window:, :-window] + table[:-window, :-window]
+        )
+
+        found: List[Hotspot] = []
+        for _ in range(max(0, int(top_k))):
+            flat_index = int(np.argmax(sums))
+            y, x = np.unravel_index(flat_index, sums.shape)
+            mass = float(sums[y, x])
+            if not np.isfinite(mass) or mass <= 0.0:
+                break
+            found.append(
+                Hotspot(
+                    box=self._to_image_box(x, y, x + window, y + window),
+                    mass=mass,
+                    share=mass / self.total if self.total > 0.0 else 0.0,
+                )
+            )
+            sums[max(0, y - window + 1):y + window, max(0, x - window + 1):x + window] = -np.inf
+        return found
+
+    def _span_mass(self, rows: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> float:
+        # Row-wise prefix sums fall out of the 2D table as adjacent-row differences.
+        table = self._table
+        span_sums = (
+            table[rows + 1, ends] - table[rows, ends]
+            - table[rows + 1, starts] + table[rows, starts]
+        )
+        return float(span_sums.sum())
+
+    def _to_grid(self, boxes: Sequence[Sequence[float]]):
+        coords = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        x0 = np.clip(np.floor(coords[:, 0] * self._scale_x), 0, self.width).astype(np.intp)
+        y0 = np.clip(np.floor(coords[:, 1] * self._scale_y), 0, self.height).astype(np.intp)
+        x1 = np.clip(np.ceil(coords[:, 2] * self._scale_x), 0, self.width).astype(np.intp)
+        y1 = np.clip(np.ceil(coords[:, 3] * self._scale_y), 0, self.height).astype(np.intp)
+        return x0, y0, np.maximum(x1, x0), np.maximum(y1, y0)
+
+    def _to_image_box(self, x0: int, y0: int, x1: int, y1: int) -> Box:
+        return (
+            int(round(x0 / self._scale_x)),
+            int(round(y0 / self._scale_y)),
+            int(round(x1 / self._scale_x)),
+            int(round(y1 / self._scale_y)),
+        )
+
+
+def build_region_indexes(
+    result: AttentionResult,
+    hint_maps: Optional[Dict[str, np.ndarray]] = None,
+    image_size: Optional[Tuple[int, int]] = None,
+) -> Dict[str, RegionIndex]:
+    """Index the fused attention map, each feature map and each hint map by name.
+
+    Feature maps are only present when the result came from
+    run_attention(image, keep_feature_maps=True).
+    """
+    indexes = {"attention": RegionIndex(result.attention_map, image_size)}
+    for name, feature_map in result.feature_maps.items():
+        indexes[name] = RegionIndex(feature_map, image_size)
+    for name, hint_map in (hint_maps or {}).items():
+        if hint_map is not None:
+            indexes[name] = RegionIndex(hint_map, image_size)
+    return indexes
+
+
+def _pixel_column(cross_x: np.ndarray, width: int) -> np.ndarray:
+    # First pixel whose center (col + 0.5) lies at or right of the crossing.
+    with np.errstate(invalid="ignore"):
+        columns = np.ceil(np.minimum(cross_x, width) - 0.5)
+    return np.clip(columns, 0, width).astype(np.intp)
@@ -0,0 +1,146 @@
+"""Standard saliency-vs-fixation metrics, vectorized over a stack of maps.
+
+Every metric accepts saliency maps shaped (H, W) or (N, H, W) and returns a
+float or an (N,) array respectively, so several hint settings for one image
+are scored in a single pass. Definitions follow the MIT saliency benchmark.
+"""
+from __future__ import annotations
+
+from typing import Dict, Union
+
+import numpy as np
+
+EPS = np.finfo(np.float64).eps
+
+MetricValue = Union[float, np.ndarray]
+
+
+def auc_judd(saliency: np.ndarray, fixation_map: np.ndarray) -> MetricValue:
+    """Area under the ROC curve with one threshold per fixated saliency value.
+
+    A flat map has no ranking to score and yields NaN.
+    """
+    maps, squeeze = _as_stack(saliency)
+    fixated = _fixation_mask(fixation_map, maps.shape[1:])
+    count, pixels = int(fixated.sum()), fixated.size
+    if count == 0 or count == pixels:
+        return _finish(np.full(len(maps), np.nan), squeeze)
+
+    flat = _min_max(maps).reshape(len(maps), -1)
+    thresholds = -np.sort(-flat[:, fixated.ravel()], axis=1)
+
+    # Offset each row into its own [2i, 2i + 1] band so one searchsorted call
+    # counts "pixels >= threshold" for every map at once.
+    offsets = 2.0 * np.arange(len(maps))[:, None]
+    ranked = np.sort((flat + offsets).ravel())
+    above = flat.size - np.searchsorted(ranked, (thresholds + offsets).ravel(), "left")
+    later_rows = len(maps) - 1 - np.arange(len(maps))
+    above = above.reshape(thresholds.shape) - later_rows[:, None] * pixels
+
+    hits = np.arange(1, count + 1, dtype=np.float64)[None, :]
+    tp = np.broadcast_to(hits / count, above.shape)
+    fp = (above - hits) / float(pixels - count)
+    zeros = np.zeros((len(maps), 1))
+    ones = np.ones((len(maps), 1))
+    tp = np.concatenate([zeros, tp, ones], axis=1)
+    fp = np.concatenate([zeros, fp, ones], axis=1)
+    area = ((fp[:, 1:] - fp[:, :-1]) * (tp[:, 1:] + tp[:, :-1])).sum(axis=1) / 2.0
+    flat_maps = np.ptp(maps, axis=(1, 2)) < EPS
+    return _finish(np.where(flat_maps, np.nan, area), squeeze)
+
+
+def nss(saliency: np.ndarray, fixation_map: np.ndarray) -> MetricValue:
+    """Mean of the standardized saliency at fixated pixels; NaN for a flat map."""
+    maps, squeeze = _as_stack(saliency)
+    fixated = _fixation_mask(fixation_map, maps.shape[1:])
+    if not fixated.any():
+        return _finish(np.full(len(maps), np.nan), squeeze)
+    mean = maps.mean(axis=(1, 2), keepdims=True)
+    std = maps.std(axis=(1, 2), ddof=1, keepdims=True)
+    standardized = (maps - mean) / np.maximum(std, EPS)
+    scores = standardized[:, fixated].mean(axis=1)
+    flat_maps = np.ptp(maps, axis=(1, 2)) < EPS
+    return _finish(np.where(flat_maps, np.nan, scores), squeeze)
+
+
+def cc(saliency: np.ndarray, density_map: np.ndarray) -> MetricValue:
+    """Pearson correlation between saliency and the fixation density map."""
+    maps, squeeze = _as_stack(saliency)
+    density = _density(density_map, maps.shape[1:])
+    a = maps - maps.mean(axis=(1, 2), keepdims=True)
+    b = density - density.mean()
+    denominator = np.sqrt((a * a).sum(axis=(1, 2)) * (b * b).sum())
+    return _finish((a * b).sum(axis=(1, 2)) / np.maximum(denominator, EPS), squeeze)
+
+
+def sim(saliency: np.ndarray, density_map: np.ndarray) -> MetricValue:
+    """Histogram intersection of the two maps as distributions."""
+    maps, squeeze = _as_stack(saliency)
+    density = _density(density_map, maps.shape[1:])
+    p = _as_distribution(_min_max(maps))
+    q = _as_distribution(_min_max(density[None]))
+    return _finish(np.minimum(p, q).sum(axis=(1, 2)), squeeze)
+
+
+def kl_divergence(saliency: np.ndarray, density_map: np.ndarray) -> MetricValue:
+    """KL(density || saliency) with both maps normalized to sum to one."""
+    maps, squeeze = _as_stack(saliency)
+    density = _density(density_map, maps.shape[1:])
+    p = _as_distribution(maps)
+    q = _as_distribution(density[None])
+    return _finish((q * np.log(EPS + q / (p + EPS))).sum(axis=(1, 2)), squeeze)
+
+
+def compute_all(
+    saliency: np.ndarray,
+    fixation_map: np.ndarray,
+    density_map: np.ndarray,
+) -> Dict[str, MetricValue]:
+    """Return every metric keyed by its conventional short name."""
+    return {
+        "auc_judd": auc_judd(saliency, fixation_map),
+        "nss": nss(saliency, fixation_map),
+        "cc": cc(saliency, density_map),
+        "sim": sim(saliency, density_map),
+        "kl": kl_divergence(saliency, density_map),
+    }
+
+
+def _as_stack(saliency: np.ndarray):
+    maps = np.asarray(saliency, dtype=np.float64)
+    if maps.ndim == 2:
+        return maps[None], True
+    if maps.ndim != 3:
+        raise ValueError("saliency must be shaped (H, W) or (N, H, W)")
+    return maps, False
+
+
+def _fixation_mask(fixation_map: np.ndarray, shape) -> np.ndarray:
+    return _check_shape(fixation_map, shape) > 0
+
+
+def _density(density_map: np.ndarray, shape) -> np.ndarray:
+    # A density is non-negative; clip round-off from blurring so KL stays finite.
+    return np.maximum(_check_shape(density_map, shape), 0.0)
+
+
+def _check_shape(values: np.ndarray, shape) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    if values.shape != tuple(shape):
+        raise ValueError(f"expected a map shaped {tuple(shape)}, got {values.shape}")
+    return values
+
+
+def _min_max(maps: np.ndarray) -> np.ndarray:
+    low = maps.min(axis=(1, 2), keepdims=True)
+    span = maps.max(axis=(1, 2), keepdims=True) - low
+    return (maps - low) / np.maximum(span, EPS)
+
+
+def _as_distribution(maps: np.ndarray) -> np.ndarray:
+    total = maps.sum(axis=(1, 2), keepdims=True)
+    return maps / np.maximum(total, EPS)
+
+
+def _finish(values: np.ndarray, squeeze: bool) -> MetricValue:
+    return float(values[0]) if squeeze else values
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from analysis import evaluation
+from analysis.region_index import RegionIndex
+from analysis.saliency_metrics import auc_judd, cc, compute_all, kl_divergence, nss, sim
+
+
+def _assert(condition: bool, message: str) -> None:
+    if not condition:
+        raise AssertionError(message)
+
+
+def _inside_polygon(vertices, x: float, y: float) -> bool:
+    inside = False
+    for (x0, y0), (x1, y1) in zip(vertices, vertices[1:] + vertices[:1]):
+        if (y0 <= y) != (y1 <= y):
+            if x < x0 + (y - y0) * (x1 - x0) / (y1 - y0):
+                inside = not inside
+    return inside
+
+
+def _reference_auc_judd(saliency: np.ndarray, fixated: np.ndarray) -> float:
+    # Straight loop over the MIT benchmark definition.
+    values = saliency.ravel()
+    fixated_values = np.sort(values[fixated.ravel()])[::-1]
+    count, pixels = len(fixated_values), values.size
+    tp, fp = [0.0], [0.0]
+    for i, threshold in enumerate(fixated_values):
+        above = int((values >= threshold).sum())
+        tp.append((i + 1) / count)
+        fp.append((above - i - 1) / (pixels - count))
+    tp.append(1.0)
+    fp.append(1.0)
+    return sum((fp[k + 1] - fp[k]) * (tp[k + 1] + tp[k]) / 2.0 for k in range(len(tp) - 1))
+
+
+def test_auc_judd_known_values() -> None:
+    saliency = np.arange(16, dtype=np.float64).reshape(4, 4)
+    fixations = np.zeros((4, 4))
+    fixations[3, 3] = 1.0
+    _assert(np.isclose(auc_judd(saliency, fixations), 1.0), "Peak fixation must score 1.")
+    fixations[:] = 0.0
+    fixations[0, 0] = 1.0
+    # The last threshold sits at the map minimum, so the ROC is the diagonal.
+    _assert(np.isclose(auc_judd(saliency, fixations), 0.5), "Minimum fixation must score 0.5.")
+
+
+def test_auc_judd_matches_reference_with_ties() -> None:
+    rng = np.random.default_rng(0)
+    # Few distinct levels so many thresholds tie across fixated and other pixels.
+    maps = rng.integers(0, 4, size=(3, 20, 25)).astype(np.float64)
+    fixated = rng.random((20, 25)) < 0.1
+    scores = auc_judd(maps, fixated.astype(np.float64))
+    expected = [_reference_auc_judd(m, fixated) for m in maps]
+    _assert(np.allclose(scores, expected), "Vectorized AUC must match the reference loop.")
+    _assert(np.isclose(auc_judd(maps[1], fixated), expected[1]), "A single map must match.")
+
+
+def test_metric_edge_cases() -> None:
+    saliency = np.random.rand(10, 12)
+    no_fixations = np.zeros((10, 12))
+    _assert(np.isnan(auc_judd(saliency, no_fixations)), "AUC needs at least one fixation.")
+    _assert(np.isnan(nss(saliency, no_fixations)), "NSS needs at least one fixation.")
+
+    fixations = np.zeros((10, 12))
+    fixations[2, 3] = fixations[7, 9] = 1.0
+    flat = np.full((10, 12), 0.4)
+    _assert(np.isnan(auc_judd(flat, fixations)), "A flat map has no AUC.")
+    stacked = auc_judd(np.stack([flat, saliency]), fixations)
+    _assert(np.isnan(stacked[0]) and not np.isnan(stacked[1]), "Flat rows only are NaN.")
+    _assert(np.isnan(nss(flat, fixations)), "A flat map has no NSS.")
+
+
+def test_distribution_metrics_on_identical_maps() -> None:
+    density = np.random.rand(10, 12)
+    _assert(np.isclose(cc(density, density), 1.0), "A map correlates perfectly with itself.")
+    _assert(np.isclose(cc(1.0 - density, density), -1.0), "An inverted map anticorrelates.")
+    _assert(np.isclose(sim(density, density), 1.0), "SIM of identical maps is 1.")
+    _assert(abs(kl_divergence(density, density)) < 1e-6, "KL of identical maps is 0.")
+
+
+def test_blurred_density_is_non_negative() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        image_path = Path(tmp) / "scene.png"
+        Image.new("RGB", (1024, 768)).save(image_path)
+        fixation_path = Path(tmp) / "scene.txt"
+        points = np.random.default_rng(2).random((15, 2)) * (1024, 768)
+        fixation_path.write_text("\n".join(f"{x:.1f}, {y:.1f}" for x, y in points))
+        fixation_map, density = evaluation._load_ground_truth(fixation_path, image_path, (768, 1024), 0.025)
+    _assert(fixation_map.sum() == 15, "Every point must land on the fixation map.")
+    _assert(float(density.min()) >= 0.0, "Blurred density must not go negative.")
+
+
+def test_npy_fixation_maps_must_be_binary() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        image_path = Path(tmp) / "scene.png"
+        Image.new("RGB", (16, 12)).save(image_path)
+        binary = np.zeros((12, 16), dtype=np.uint8)
+        binary[3, 4] = binary[8, 10] = 255
+        np.save(Path(tmp) / "binary.npy", binary)
+        points, size = evaluation._read_fixation_points(Path(tmp) / "binary.npy", image_path)
+        _assert(len(points) == 2 and size == (16, 12), "Binary maps give one point per fixation.")
+
+        np.save(Path(tmp) / "density.npy", np.random.rand(12, 16))
+        try:
+            evaluation._read_fixation_points(Path(tmp) / "density.npy", image_path)
+        except ValueError:
+            return
+    raise AssertionError("Continuous .npy maps must be rejected.")
+
+
+def test_evaluation_end_to_end_with_cache() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / "images").mkdir()
+        (root / "fixations").mkdir()
+        image_path = root / "images" / "scene.png"
+        Image.new("RGB", (128, 96), (90, 120, 150)).save(image_path)
+        (root / "fixations" / "scene.txt").write_text("20, 30\n64, 48\n100.5, 70\n")
+
+        # Seed the map cache so the sweep runs without the core library.
+        yy, xx = np.mgrid[0:96, 0:128].astype(np.float32)
+        core = np.exp(-((yy - 48) ** 2 + (xx - 64) ** 2) / 800.0).astype(np.float32)
+        face = np.zeros_like(core)
+        face[20:40, 10:30] = 1.0
+        text = np.zeros_like(core)
+        text[60:80, 90:120] = 1.0
+        cache = root / "cache"
+        cache.mkdir()
+        maps_path = cache / f"{evaluation._file_digest(image_path, extra='None')}.npz"
+        np.savez(maps_path, attention=core, face=face, text=text)
+
+        first = evaluation.HintSetting(0.6, 0.6, 1.0)
+        second = evaluation.HintSetting(1.0, 0.3, 0.8)
+
+        def run(settings):
+            return evaluation.evaluate_dataset(
+                root / "images", root / "fixations", settings=settings,
+                max_side=None, workers=1, cache_dir=cache,
+            ).images[0].metrics
+
+        initial = run([first])
+        for label in (evaluation.CORE_LABEL, first.label):
+            for name in evaluation.METRIC_NAMES:
+                _assert(np.isfinite(initial[label][name]), f"{label} {name} must be finite.")
+
+        # Only the new setting is computed; cached rows keep their labels.
+        extended = run([second, first])
+        _assert(extended[first.label] == initial[first.label], "Cached setting must not change.")
+        _assert(extended[evaluation.CORE_LABEL] == initial[evaluation.CORE_LABEL], "Cached core must not change.")
+        fixation_map, density = evaluation._load_ground_truth(
+            root / "fixations" / "scene.txt", image_path, core.shape, 0.025
+        )
+        expected = compute_all(
+            evaluation.apply_hints(core, face, text, 1.0, 0.3, 0.8), fixation_map, density
+        )
+        for name in evaluation.METRIC_NAMES:
+            _assert(np.isclose(extended[second.label][name], expected[name]), f"{name} row mismatch.")
+
+        # With the maps gone, a repeat run can only succeed from the results cache.
+        maps_path.unlink()
+        repeat = run([second, first])
+        _assert(repeat == extended, "Repeat run must return the cached numbers.")
+        _assert(not maps_path.exists(), "Repeat run must not recompute maps.")
+
+
+def test_box_masses_match_slices() -> None:
+    values = np.random.rand(30, 40).astype(np.float32)
+    index = RegionIndex(values)
+    boxes = [(0, 0, 40, 30), (5, 3, 17, 21), (35, 25, 90, 90), (8, 8, 8, 12)]
+    expected = [values[y0:y1, x0:x1].sum() for x0, y0, x1, y1 in boxes]
+    _assert(np.allclose(index.box_masses(boxes), expected), "Box masses must match slice sums.")
+    _assert(np.isclose(index.box_shares([(0, 0, 40, 30)])[0], 1.0), "Full box holds all mass.")
+
+
+def test_box_masses_scale_with_image_size() -> None:
+    values = np.random.rand(30, 40).astype(np.float32)
+    index = RegionIndex(values, image_size=(80, 60))
+    _assert(
+        np.isclose(index.box_mass((10, 6, 34, 42)), values[3:21, 5:17].sum()),
+        "Image-pixel boxes must map onto the map grid.",
+    )
+
+
+def test_polygon_mass_matches_pixel_centers() -> None:
+    values = np.random.rand(30, 40).astype(np.float32)
+    index = RegionIndex(values)
+    for vertices in (
+        [(5.0, 5.0), (30.0, 2.0), (36.0, 22.0), (10.0, 28.0)],
+        [(-4.0, -4.0), (50.0, 6.0), (20.0, 40.0)],
+        [(5.0, 5.0), (35.0, 5.0), (35.0, 25.0), (20.0, 12.0), (5.0, 25.0)],
+    ):
+        mask = np.array(
+            [[_inside_polygon(vertices, x + 0.5, y + 0.5) for x in range(40)] for y in range(30)]
+        )
+        _assert(
+            np.isclose(index.polygon_mass(vertices), values[mask].sum()),
+            "Polygon mass must match a pixel-center point-in-polygon sum.",
+        )
+        _assert(np.isclose(index.mask_mass(mask), values[mask].sum()), "Mask mass mismatch.")
+
+
+def test_mask_mass_matches_masked_sum() -> None:
+    values = np.random.rand(30, 40).astype(np.float32)
+    index = RegionIndex(values)
+    rng = np.random.default_rng(1)
+    edges = np.zeros((30, 40), dtype=bool)
+    edges[:, 0] = edges[:, -1] = edges[0, :] = True
+    blob = np.zeros((30, 40), dtype=bool)
+    blob[4:20, 10:33] = rng.random((16, 23)) < 0.6
+    for mask in (rng.random((30, 40)) < 0.3, edges, blob, np.ones((30, 40), dtype=bool)):
+        _assert(np.isclose(index.mask_mass(mask), values[mask].sum()), "Mask mass must match a masked sum.")
+    _assert(index.mask_mass(np.zeros((30, 40), dtype=bool)) == 0.0, "An empty mask holds no mass.")
+
+
+def test_hotspots_on_empty_map() -> None:
+    _assert(RegionIndex(np.zeros((0, 12))).hotspots() == [], "A zero-height map has no hotspots.")
+    _assert(RegionIndex(np.zeros((12, 0))).hotspots() == [], "A zero-width map has no hotspots.")
+
+
+def test_hotspots_find_peaks_without_overlap() -> None:
+    values = np.zeros((40, 40), dtype=np.float32)
+    values[5:9, 5:9] = 1.0
+    values[30:34, 28:32] = 0.5
+    hotspots = RegionIndex(values).hotspots(top_k=5, window=4)
+    _assert(len(hotspots) == 2, "Only windows holding mass should be returned.")
+    _assert(hotspots[0].box == (5, 5, 9, 9), "Strongest peak comes first.")
+    _assert(hotspots[1].box == (28, 30, 32, 34), "Second peak must be found.")
+    _assert(np.isclose(sum(h.share for h in hotspots), 1.0), "Shares must cover all mass.")
+
+
+def run_smoke_tests() -> None:
+    test_box_masses_match_slices()
+    test_box_masses_scale_with_image_size()
+    test_polygon_mass_matches_pixel_centers()
+    test_mask_mass_matches_masked_sum()
+    test_hotspots_on_empty_map()
+    test_hotspots_find_peaks_without_overlap()
+    test_auc_judd_known_values()
+    test_auc_judd_matches_reference_with_ties()
+    test_metric_edge_cases()
+    test_distribution_metrics_on_identical_maps()
+    test_blurred_density_is_non_negative()
+    test_npy_fixation_maps_must_be_binary()
+    test_evaluation_end_to_end_with_cache()
+    print("Analysis smoke tests passed.")
+
+
+if __name__ == "__main__":
+    run_smoke_tests()
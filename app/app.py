@@ -2,19 +2,39 @@ from __future__ import annotations
 
 import sys
 from pathlib import Path
+from typing import List, Optional, Tuple
 
 import numpy as np
 import streamlit as st
-from PIL import Image
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.append(str(ROOT))
 
-from explanation import format_feature_explanation, summarize_feature_contributions
-from visualization import build_heatmap_image, build_heatmap_legend, build_heatmap_overlay
+from explanation import (
+    format_feature_explanation,
+    summarize_feature_contributions,
+    summarize_region_contributions,
+)
+from visualization import (
+    build_heatmap_image,
+    build_heatmap_legend,
+    build_heatmap_overlay,
+    shared_value_range,
+)
+from comparison import compute_comparison
+from analysis.region_index import RegionIndex
 from core_adapter.attention_runner import run_attention
-from phase3.runner import run_phase3
+from core_adapter.image_loader import load_image
+from phase3.precision import FULL, REDUCED, max_final_deviation
+from phase3.runner import phase3_input, run_phase3
+
+_WORKING_RESOLUTIONS = {
+    "Full resolution": None,
+    "2048 px": 2048,
+    "1024 px (fast)": 1024,
+}
+_COMPARISON_COLUMNS = 3
 
 
 def main() -> None:
@@ -30,6 +50,22 @@ def main() -> None:
         "it does not classify or interpret image content."
     )
 
+    mode = st.radio(
+        "Mode",
+        ["Single image", "Compare images"],
+        horizontal=True,
+    )
+    resolution_label = st.selectbox(
+        "Working resolution (long edge)",
+        list(_WORKING_RESOLUTIONS),
+        index=0,
+    )
+    max_side = _WORKING_RESOLUTIONS[resolution_label]
+
+    if mode == "Compare images":
+        _render_comparison(max_side)
+        return
+
     uploaded_file = st.file_uploader(
         "Upload an image (PNG or JPG)", type=["png", "jpg", "jpeg"]
     )
@@ -38,43 +74,14 @@ def main() -> None:
         st.info("Awaiting an image upload.")
         return
 
-    image = Image.open(uploaded_file).convert("RGB")
+    image = load_image(uploaded_file, max_side=max_side)
 
     with st.spinner("Computing attention map..."):
         result = run_attention(image)
 
     legend = build_heatmap_legend()
 
-    st.subheader("Phase 3 (Layer 2 hints)")
-    enable_phase3 = st.toggle("Enable Phase 3 (Layer 2 hints)", value=False)
-    controls = st.columns(3)
-    with controls[0]:
-        alpha = st.slider(
-            "Alpha (face hint strength)",
-            0.0,
-            2.0,
-            0.6,
-            0.05,
-            disabled=not enable_phase3,
-        )
-    with controls[1]:
-        beta = st.slider(
-            "Beta (text hint strength)",
-            0.0,
-            2.0,
-            0.6,
-            0.05,
-            disabled=not enable_phase3,
-        )
-    with controls[2]:
-        blend = st.slider(
-            "Blend (core ↔ hints)",
-            0.0,
-            1.0,
-            1.0,
-            0.05,
-            disabled=not enable_phase3,
-        )
+    enable_phase3, alpha, beta, blend, precision = _phase3_controls()
 
     view_mode = st.radio(
         "View mode",
@@ -82,13 +89,13 @@ def main() -> None:
         horizontal=True,
     )
 
-    image_array = np.asarray(image, dtype=np.float32)
+    image_array = phase3_input(image, precision)
     final_attention = result.attention_map
     hint_maps = {}
     if enable_phase3:
         try:
             final_attention, hint_maps = run_phase3(
-                image_array, result.attention_map, alpha, beta, blend
+                image_array, result.attention_map, alpha, beta, blend, precision=precision
             )
         except Exception as exc:
             st.warning(f"Phase 3 ran with partial hints: {exc}")
@@ -152,10 +159,197 @@ def main() -> None:
             st.markdown(f"**{label}** — {percent:.0f}%")
             st.caption(description)
 
+    _render_region_contributions(attention_map, image.size)
+
     st.caption(
         "This demo is deterministic and does not perform classification or learning."
     )
 
 
+def _phase3_controls() -> Tuple[bool, float, float, float, str]:
+    st.subheader("Phase 3 (Layer 2 hints)")
+    enable_phase3 = st.toggle("Enable Phase 3 (Layer 2 hints)", value=False)
+    controls = st.columns(3)
+    with controls[0]:
+        alpha = st.slider(
+            "Alpha (face hint strength)",
+            0.0,
+            2.0,
+            0.6,
+            0.05,
+            disabled=not enable_phase3,
+        )
+    with controls[1]:
+        beta = st.slider(
+            "Beta (text hint strength)",
+            0.0,
+            2.0,
+            0.6,
+            0.05,
+            disabled=not enable_phase3,
+        )
+    with controls[2]:
+        blend = st.slider(
+            "Blend (core ↔ hints)",
+            0.0,
+            1.0,
+            1.0,
+            0.05,
+            disabled=not enable_phase3,
+        )
+    reduced = st.checkbox(
+        "Reduced precision (uint8 hints, float16 output)",
+        value=False,
+        disabled=not enable_phase3,
+        help=(
+            "Uses less memory bandwidth on large images. Final values differ "
+            f"from full precision by at most ~{max_final_deviation(alpha, beta, blend):.3f} "
+            "when the core map spans [0, 1]."
+        ),
+    )
+    return enable_phase3, alpha, beta, blend, REDUCED if reduced else FULL
+
+
+def _render_comparison(max_side: Optional[int]) -> None:
+    uploaded_files = st.file_uploader(
+        "Upload images to compare (PNG or JPG)",
+        type=["png", "jpg", "jpeg"],
+        accept_multiple_files=True,
+    )
+    if not uploaded_files:
+        st.info("Awaiting image uploads.")
+        return
+
+    enable_phase3, alpha, beta, blend, precision = _phase3_controls()
+
+    with st.spinner(f"Computing attention maps for {len(uploaded_files)} images..."):
+        entries = compute_comparison(
+            uploaded_files,
+            [uploaded.name for uploaded in uploaded_files],
+            max_side=max_side,
+            enable_phase3=enable_phase3,
+            alpha=alpha,
+            beta=beta,
+            blend=blend,
+            precision=precision,
+        )
+
+    for entry in entries:
+        if entry.phase3_error:
+            st.warning(f"{entry.name}: Phase 3 ran with partial hints: {entry.phase3_error}")
+
+    value_range = shared_value_range(entry.final_attention for entry in entries)
+    st.caption(
+        "All maps share one color scale, so equal colors mean equal attention "
+        "values across images."
+    )
+    st.image(build_heatmap_legend(), use_column_width=False)
+
+    show_face = show_text = False
+    if enable_phase3:
+        show_face = st.checkbox("Show face hint maps", value=False)
+        show_text = st.checkbox("Show text hint maps", value=False)
+
+    for start in range(0, len(entries), _COMPARISON_COLUMNS):
+        row = entries[start:start + _COMPARISON_COLUMNS]
+        cols = st.columns(_COMPARISON_COLUMNS)
+        for col, entry in zip(cols, row):
+            with col:
+                st.markdown(f"**{entry.name}**")
+                overlay = build_heatmap_overlay(
+                    entry.image, entry.final_attention, value_range=value_range
+                )
+                st.image(overlay, use_column_width=True)
+                hint_views = (
+                    ("face", "Face hint", show_face),
+                    ("text", "Text hint", show_text),
+                )
+                for key, label, shown in hint_views:
+                    if not shown:
+                        continue
+                    hint_map = entry.hint_maps.get(key)
+                    if hint_map is None:
+                        st.caption(f"{label}: no hint map available.")
+                    else:
+                        st.caption(label)
+                        st.image(
+                            build_heatmap_image(hint_map, entry.image.size),
+                            use_column_width=True,
+                        )
+                for label, percent, _ in summarize_feature_contributions(
+                    entry.result.feature_scores
+                ):
+                    st.markdown(f"{label} — {percent:.0f}%")
+
+
+def _render_region_contributions(attention_map: np.ndarray, image_size: Tuple[int, int]) -> None:
+    st.subheader("Region contributions")
+    region_text = st.text_area(
+        "Regions to measure (one per line: label, x0, y0, x1, y1 in image pixels)",
+        value="",
+        placeholder="Headline, 40, 20, 600, 90",
+    )
+    named_boxes, errors = _parse_regions(region_text)
+    for error in errors:
+        st.warning(error)
+
+    index = RegionIndex(attention_map, image_size=image_size)
+    width, height = image_size
+    image_area = float(width * height)
+
+    if named_boxes:
+        boxes = [box for _, box in named_boxes]
+        shares = index.box_shares(boxes)
+        regions = [
+            (label, float(share), _box_area(box, image_size) / image_area)
+            for (label, box), share in zip(named_boxes, shares)
+        ]
+    else:
+        st.caption("No regions given; showing the strongest attention hotspots.")
+        regions = []
+        for rank, hotspot in enumerate(index.hotspots(top_k=5), start=1):
+            x0, y0, x1, y1 = hotspot.box
+            regions.append(
+                (
+                    f"Hotspot {rank} ({x0}, {y0})–({x1}, {y1})",
+                    hotspot.share,
+                    _box_area(hotspot.box, image_size) / image_area,
+                )
+            )
+
+    rows = [
+        {"Region": label, "Attention share": f"{percent:.1f}%", "Note": description}
+        for label, percent, description in summarize_region_contributions(regions)
+    ]
+    if rows:
+        st.table(rows)
+
+
+def _parse_regions(text: str) -> Tuple[List[Tuple[str, Tuple[float, ...]]], List[str]]:
+    regions: List[Tuple[str, Tuple[float, ...]]] = []
+    errors: List[str] = []
+    for line_number, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        parts = [part.strip() for part in line.split(",")]
+        try:
+            if len(parts) != 5:
+                raise ValueError
+            box = tuple(float(part) for part in parts[1:])
+        except ValueError:
+            errors.append(f"Region line {line_number} is not 'label, x0, y0, x1, y1'.")
+            continue
+        regions.append((parts[0] or f"Region {line_number}", box))
+    return regions, errors
+
+
+def _box_area(box: Tuple[float, ...], image_size: Tuple[int, int]) -> float:
+    x0, y0, x1, y1 = box
+    width, height = image_size
+    x0, x1 = max(0.0, min(x0, width)), max(0.0, min(x1, width))
+    y0, y1 = max(0.0, min(y0, height)), max(0.0, min(y1, height))
+    return max(0.0, x1 - x0) * max(0.0, y1 - y0)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,103 @@
+"""Concurrent attention computation for the multi-image comparison mode."""
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import BinaryIO, Dict, List, Optional, Sequence
+
+import numpy as np
+from PIL import Image
+
+from core_adapter.attention_runner import AttentionResult, run_attention
+from core_adapter.image_loader import load_image
+from phase3.precision import FULL
+from phase3.runner import phase3_input, run_phase3
+
+
+@dataclass
+class ComparisonEntry:
+    name: str
+    image: Image.Image
+    result: AttentionResult
+    final_attention: np.ndarray
+    hint_maps: Dict[str, np.ndarray] = field(default_factory=dict)
+    phase3_error: Optional[str] = None
+
+
+def compute_comparison(
+    sources: Sequence[BinaryIO],
+    names: Sequence[str],
+    max_side: Optional[int] = None,
+    enable_phase3: bool = False,
+    alpha: float = 0.6,
+    beta: float = 0.6,
+    blend: float = 1.0,
+    max_workers: Optional[int] = None,
+    precision: str = FULL,
+) -> List[ComparisonEntry]:
+    """Decode and score every source on a thread pool, preserving input order.
+
+    Decoding, NumPy and the OpenCV hint detectors release the GIL for much of
+    their work, so images overlap; how close the total gets to the slowest
+    single image depends on how much of the core pipeline does the same and
+    on the core count (benchmarks/bench_comparison.py measures it). On one
+    core the pool is no faster than scoring the images in turn.
+    """
+    if len(sources) != len(names):
+        raise ValueError("sources and names must have the same length")
+    if not sources:
+        return []
+
+    if max_workers is None:
+        max_workers = min(len(sources), os.cpu_count() or 1)
+
+    def _task(index: int) -> ComparisonEntry:
+        return _compute_entry(
+            sources[index],
+            names[index],
+            max_side,
+            enable_phase3,
+            alpha,
+            beta,
+            blend,
+            precision,
+        )
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(_task, range(len(sources))))
+
+
+def _compute_entry(
+    source: BinaryIO,
+    name: str,
+    max_side: Optional[int],
+    enable_phase3: bool,
+    alpha: float,
+    beta: float,
+    blend: float,
+    precision: str,
+) -> ComparisonEntry:
+    image = load_image(source, max_side=max_side)
+    result = run_attention(image)
+    entry = ComparisonEntry(
+        name=name,
+        image=image,
+        result=result,
+        final_attention=result.attention_map,
+    )
+    if not enable_phase3:
+        return entry
+
+    try:
+        entry.final_attention, entry.hint_maps = run_phase3(
+            phase3_input(image, precision),
+            result.attention_map,
+            alpha,
+            beta,
+            blend,
+            precision=precision,
+        )
+    except Exception as exc:
+        entry.phase3_error = str(exc)
+    return entry
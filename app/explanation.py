@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Dict, List, Tuple
+from typing import Dict, List, Sequence, Tuple
 
 
 _FEATURE_EXPLANATIONS = {
@@ -61,3 +61,23 @@ def summarize_feature_contributions(
         )
         summaries.append((label, float(score) * 100.0, description))
     return summaries
+
+
+def summarize_region_contributions(
+    regions: Sequence[Tuple[str, float, float]],
+) -> List[Tuple[str, float, str]]:
+    """Return (label, percentage, description) tuples for region attention shares.
+
+    Each region is given as (label, attention_share, area_share), both in [0, 1].
+    """
+    summaries: List[Tuple[str, float, str]] = []
+    for label, attention_share, area_share in regions:
+        ratio = attention_share / area_share if area_share > 0.0 else 0.0
+        if ratio >= 1.5:
+            description = f"Draws {ratio:.1f}x the attention its size alone would suggest."
+        elif ratio <= 0.67:
+            description = "Draws less attention than its size would suggest."
+        else:
+            description = "Draws attention roughly in proportion to its size."
+        summaries.append((label, float(attention_share) * 100.0, description))
+    return summaries
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import io
+import sys
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+APP_DIR = Path(__file__).resolve().parent
+for path in (APP_DIR.parent, APP_DIR):
+    if str(path) not in sys.path:
+        sys.path.append(str(path))
+
+from visualization import _normalize_attention, build_heatmap_image, shared_value_range
+
+
+def _assert(condition: bool, message: str) -> None:
+    if not condition:
+        raise AssertionError(message)
+
+
+def test_shared_value_range_spans_all_maps() -> None:
+    low = np.array([[0.2, 0.4], [0.3, 0.5]], dtype=np.float32)
+    high = np.array([[0.1, 0.9], [0.6, 0.7]], dtype=np.float32)
+    _assert(shared_value_range([low, high]) == (np.float32(0.1), np.float32(0.9)), "Range must span both maps.")
+    _assert(shared_value_range(iter([low])) == (np.float32(0.2), np.float32(0.5)), "Generators must work.")
+    _assert(shared_value_range([]) == (0.0, 1.0), "No maps falls back to the unit range.")
+
+
+def test_normalize_attention_with_value_range() -> None:
+    values = np.array([[0.25, 0.5], [0.75, 1.0]], dtype=np.float32)
+    own = _normalize_attention(values)
+    shared = _normalize_attention(values, value_range=(0.0, 1.0))
+    _assert(np.allclose(own, [[0.0, 1 / 3], [2 / 3, 1.0]]), "Default stretches to the map's own range.")
+    _assert(np.allclose(shared, values), "A shared range must keep absolute levels.")
+
+    out = np.empty((2, 2), dtype=np.float32)
+    result = _normalize_attention(values, value_range=(0.5, 0.5), out=out)
+    _assert(result is out and not out.any(), "An empty range normalizes to zeros in out.")
+    _assert(np.allclose(values, [[0.25, 0.5], [0.75, 1.0]]), "Input must not be modified.")
+
+
+def test_shared_scale_keeps_weaker_map_darker() -> None:
+    strong = np.linspace(0.0, 1.0, 64, dtype=np.float32).reshape(8, 8)
+    weak = strong * 0.5
+    value_range = shared_value_range([strong, weak])
+    strong_image = np.asarray(build_heatmap_image(strong, (8, 8), value_range))
+    weak_image = np.asarray(build_heatmap_image(weak, (8, 8), value_range))
+    own_image = np.asarray(build_heatmap_image(weak, (8, 8)))
+    _assert(weak_image.sum() < strong_image.sum(), "Weaker map must render darker on a shared scale.")
+    _assert(np.array_equal(own_image, strong_image), "Per-map scaling hides the difference.")
+
+
+def test_comparison_preserves_input_order() -> None:
+    try:
+        from comparison import compute_comparison
+    except ModuleNotFoundError as exc:
+        if not (exc.name or "").startswith("core"):
+            raise
+        print("Core library not installed; skipping compute_comparison check.")
+        return
+
+    sources = []
+    for shade in (30, 120, 220):
+        buffer = io.BytesIO()
+        Image.new("RGB", (48, 32), (shade, shade, shade)).save(buffer, format="PNG")
+        buffer.seek(0)
+        sources.append(buffer)
+    entries = compute_comparison(sources, ["a", "b", "c"], max_side=24, max_workers=3)
+    _assert([entry.name for entry in entries] == ["a", "b", "c"], "Entries must keep input order.")
+    _assert(all(entry.image.size == (24, 16) for entry in entries), "max_side must apply to every entry.")
+    _assert(all(entry.final_attention is entry.result.attention_map for entry in entries), "Phase 3 is off.")
+
+
+def run_smoke_tests() -> None:
+    test_shared_value_range_spans_all_maps()
+    test_normalize_attention_with_value_range()
+    test_shared_scale_keeps_weaker_map_darker()
+    test_comparison_preserves_input_order()
+    print("App smoke tests passed.")
+
+
+if __name__ == "__main__":
+    run_smoke_tests()
@@ -1,53 +1,121 @@
 from __future__ import annotations
 
-from typing import Tuple
+from typing import Iterable, Optional, Tuple
 
 import numpy as np
 from PIL import Image
 
+from phase3.workspace import Workspace, get_workspace
+
+# (offset, span) per RGB channel: each ramps from 0 to 1 over [offset, offset + span].
+_COLORMAP_RAMPS = ((0.0, 1.0), (0.3, 0.7), (0.75, 0.25))
+
 
 def build_heatmap_overlay(
     image: Image.Image,
     attention_map: np.ndarray,
     alpha: float = 0.45,
+    value_range: Optional[Tuple[float, float]] = None,
 ) -> Image.Image:
     """Return an RGB image with a heatmap overlay."""
     base = image.convert("RGB")
-    heatmap = build_heatmap_image(attention_map, base.size)
+    heatmap = build_heatmap_image(attention_map, base.size, value_range=value_range)
     overlay = Image.blend(base, heatmap, alpha=alpha)
     return overlay
 
 
-def build_heatmap_image(attention_map: np.ndarray, size: Tuple[int, int]) -> Image.Image:
-    """Return an RGB heatmap image resized to the given size."""
-    return _prepare_heatmap(attention_map, size)
+def build_heatmap_image(
+    attention_map: np.ndarray,
+    size: Tuple[int, int],
+    value_range: Optional[Tuple[float, float]] = None,
+) -> Image.Image:
+    """Return an RGB heatmap image resized to the given size.
+
+    By default each map is stretched to its own min/max. Pass value_range to
+    color several maps on one shared scale so they can be compared directly.
+    """
+    return _prepare_heatmap(attention_map, size, value_range)
+
+
+def shared_value_range(attention_maps: Iterable[np.ndarray]) -> Tuple[float, float]:
+    """Return the (min, max) spanning all maps, for use as a shared value_range."""
+    mins = []
+    maxs = []
+    for attention_map in attention_maps:
+        mins.append(float(np.min(attention_map)))
+        maxs.append(float(np.max(attention_map)))
+    if not mins:
+        return 0.0, 1.0
+    return min(mins), max(maxs)
 
 
-def _prepare_heatmap(attention_map: np.ndarray, size: Tuple[int, int]) -> Image.Image:
-    normalized = _normalize_attention(attention_map)
-    heatmap_rgb = _apply_colormap(normalized)
+def _prepare_heatmap(
+    attention_map: np.ndarray,
+    size: Tuple[int, int],
+    value_range: Optional[Tuple[float, float]] = None,
+) -> Image.Image:
+    workspace = get_workspace()
+    shape = attention_map.shape[:2]
+    normalized = _normalize_attention(
+        attention_map,
+        value_range,
+        out=workspace.buffer("heatmap.normalized", shape),
+    )
+    heatmap_rgb = _apply_colormap(
+        normalized,
+        out=workspace.buffer("heatmap.rgb", shape + (3,), np.uint8),
+        workspace=workspace,
+    )
+    # fromarray copies into PIL's own storage, so the workspace can be reused.
     heatmap_image = Image.fromarray(heatmap_rgb, mode="RGB")
     return heatmap_image.resize(size, resample=Image.BILINEAR)
 
 
-def _normalize_attention(attention_map: np.ndarray) -> np.ndarray:
+def _normalize_attention(
+    attention_map: np.ndarray,
+    value_range: Optional[Tuple[float, float]] = None,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    shape = attention_map.shape[:2]
+    if out is None:
+        out = np.empty(shape, dtype="float32")
     if attention_map.ndim == 3:
-        attention_map = attention_map.mean(axis=2)
-    attention_map = attention_map.astype("float32")
-    min_val = float(np.min(attention_map))
-    max_val = float(np.max(attention_map))
+        np.mean(attention_map, axis=2, out=out)
+    else:
+        np.copyto(out, attention_map, casting="unsafe")
+    if value_range is None:
+        min_val = float(np.min(out))
+        max_val = float(np.max(out))
+    else:
+        min_val, max_val = float(value_range[0]), float(value_range[1])
     if max_val - min_val < 1e-6:
-        return np.zeros_like(attention_map, dtype="float32")
-    return (attention_map - min_val) / (max_val - min_val)
+        out.fill(0.0)
+        return out
+    out -= min_val
+    out /= max_val - min_val
+    return out
 
 
-def _apply_colormap(normalized: np.ndarray) -> np.ndarray:
+def _apply_colormap(
+    normalized: np.ndarray,
+    out: Optional[np.ndarray] = None,
+    workspace: Optional[Workspace] = None,
+) -> np.ndarray:
     """Simple warm colormap from dark to yellow-white."""
-    normalized = np.clip(normalized, 0.0, 1.0)
-    red = (normalized * 255).astype(np.uint8)
-    green = (np.clip((normalized - 0.3) / 0.7, 0.0, 1.0) * 255).astype(np.uint8)
-    blue = (np.clip((normalized - 0.75) / 0.25, 0.0, 1.0) * 255).astype(np.uint8)
-    return np.stack([red, green, blue], axis=2)
+    if out is None:
+        out = np.empty(normalized.shape + (3,), dtype=np.uint8)
+    if workspace is None:
+        workspace = Workspace()
+    clipped = workspace.buffer("colormap.clipped", normalized.shape)
+    channel = workspace.buffer("colormap.channel", normalized.shape)
+    np.clip(normalized, 0.0, 1.0, out=clipped)
+    for index, (offset, span) in enumerate(_COLORMAP_RAMPS):
+        np.subtract(clipped, offset, out=channel)
+        channel /= span
+        np.clip(channel, 0.0, 1.0, out=channel)
+        channel *= 255
+        np.copyto(out[..., index], channel, casting="unsafe")
+    return out
 
 
 def build_heatmap_legend(width: int = 240, height: int = 16) -> Image.Image:
@@ -0,0 +1,157 @@
+"""Measure per-request temporaries and peak RSS of the modulation + heatmap path.
+
+Each request runs apply_hints (Phase 3 modulation) and _prepare_heatmap on a
+synthetic frame. Modes:
+    baseline    - the allocation pattern before workspaces existed (a copy of
+                  that code lives in this file as the "before" reference)
+    fresh       - current code with the workspace cleared every request
+    reused      - current code on a long-lived thread with out=None, which is
+                  how run_phase3, the app and compute_comparison call it
+    reused+out  - as reused, plus a caller-owned out= buffer; no current
+                  caller does this, so it is an upper bound on the gain
+
+Usage:
+    python benchmarks/bench_allocations.py [--size 2048] [--requests 40] [--threads 4]
+
+Hint maps are synthetic because the OpenCV detectors are not needed to
+exercise the array path.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import threading
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+for path in (ROOT, ROOT / "app"):
+    if str(path) not in sys.path:
+        sys.path.append(str(path))
+
+from PIL import Image
+
+from phase3.runner import apply_hints
+from phase3.workspace import get_workspace
+from visualization import _prepare_heatmap
+
+MODES = ("baseline", "fresh", "reused", "reused+out")
+
+
+def _inputs(size: int):
+    rng = np.random.default_rng(0)
+    core = rng.random((size, size), dtype=np.float32)
+    face = np.zeros((size, size), dtype=np.float32)
+    face[size // 4:size // 2, size // 4:size // 2] = 1.0
+    text = np.zeros((size, size), dtype=np.float32)
+    text[size // 8:size // 6, :] = 1.0
+    return core, face, text
+
+
+def _request(mode: str, core, face, text, out) -> None:
+    if mode == "baseline":
+        final = _baseline_apply_hints(core, face, text, 0.6, 0.6, 0.8)
+        _baseline_prepare_heatmap(final, (core.shape[1], core.shape[0]))
+        return
+    if mode == "fresh":
+        # Drop the thread's buffers so every request allocates from scratch.
+        get_workspace().clear()
+    if mode != "reused+out":
+        out = None
+    final = apply_hints(core, face, text, 0.6, 0.6, 0.8, out=out)
+    _prepare_heatmap(final, (core.shape[1], core.shape[0]))
+
+
+# Pre-workspace versions of apply_hints / modulate_attention / _prepare_heatmap,
+# kept verbatim in allocation pattern so the "before" numbers stay reproducible.
+def _baseline_apply_hints(core, face, text, alpha, beta, blend):
+    combined_hint = np.clip(alpha * face + beta * text, 0.0, 1.0)
+    core = np.clip(np.asarray(core, dtype=np.float32), 0.0, 1.0)
+    hint = np.clip(np.asarray(combined_hint, dtype=np.float32), 0.0, 1.0)
+    modulated = np.clip(core * (1.0 + 1.0 * hint), 0.0, 2.0)
+    min_val, max_val = float(np.min(modulated)), float(np.max(modulated))
+    normalized = np.clip((modulated - min_val) / (max_val - min_val), 0.0, 1.0)
+    if blend >= 1.0:
+        return normalized
+    return (1.0 - blend) * core + blend * normalized
+
+
+def _baseline_prepare_heatmap(attention_map, size):
+    attention_map = attention_map.astype("float32")
+    min_val, max_val = float(np.min(attention_map)), float(np.max(attention_map))
+    normalized = np.clip((attention_map - min_val) / (max_val - min_val), 0.0, 1.0)
+    red = (normalized * 255).astype(np.uint8)
+    green = (np.clip((normalized - 0.3) / 0.7, 0.0, 1.0) * 255).astype(np.uint8)
+    blue = (np.clip((normalized - 0.75) / 0.25, 0.0, 1.0) * 255).astype(np.uint8)
+    heatmap = Image.fromarray(np.stack([red, green, blue], axis=2), mode="RGB")
+    return heatmap.resize(size, resample=Image.BILINEAR)
+
+
+def _measure(mode: str, size: int, requests: int, threads: int) -> dict:
+    core, face, text = _inputs(size)
+    frame_bytes = core.nbytes
+
+    # Warm-up request so the reused mode measures steady state.
+    warm_out = np.empty_like(core)
+    _request(mode, core, face, text, warm_out)
+    tracemalloc.start()
+    start_current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    _request(mode, core, face, text, warm_out)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    thread_state = threading.local()
+
+    def worker(_: int) -> None:
+        if not hasattr(thread_state, "out"):
+            thread_state.out = np.empty_like(core)
+        _request(mode, core, face, text, thread_state.out)
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(worker, range(requests)))
+
+    return {
+        "mode": mode,
+        "temp_mb": (peak - start_current) / 1e6,
+        "temp_frames": (peak - start_current) / frame_bytes,
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=2048)
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(_measure(args.mode, args.size, args.requests, args.threads)))
+        return
+
+    print(f"{args.size}x{args.size} float32 frames, {args.requests} requests on {args.threads} threads")
+    print(f"{'mode':<12}{'temp MB/request':>17}{'frames':>9}{'peak RSS MB':>13}")
+    for mode in MODES:
+        # Separate processes so peak RSS of one mode does not mask the other.
+        output = subprocess.check_output(
+            [sys.executable, __file__, "--mode", mode, "--size", str(args.size),
+             "--requests", str(args.requests), "--threads", str(args.threads)],
+            text=True,
+        )
+        row = json.loads(output)
+        print(
+            f"{row['mode']:<12}{row['temp_mb']:>17.1f}{row['temp_frames']:>9.1f}"
+            f"{row['max_rss_mb']:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Compare serial scoring against compute_comparison's thread pool.
+
+Runs the comparison-mode pipeline (decode, core attention, optionally Phase 3)
+on N synthetic JPEGs, once one image after another and once through
+compute_comparison, and reports the total for each next to the slowest single
+image. "overlap" is serial / pooled: N means perfect overlap (the pooled total
+equals the slowest image), 1 means the pool bought nothing.
+
+Usage:
+    python benchmarks/bench_comparison.py [--images 4] [--size 1600x1200]
+        [--max-side 1024] [--workers N] [--phase3] [--repeat 3]
+
+Requires the core library (core.features, core.fusion); --phase3 also needs
+OpenCV for the text hint.
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+import numpy as np
+from PIL import Image
+
+ROOT = Path(__file__).resolve().parents[1]
+for path in (ROOT, ROOT / "app"):
+    if str(path) not in sys.path:
+        sys.path.append(str(path))
+
+from comparison import _compute_entry, compute_comparison
+
+
+def _synthetic_jpegs(count: int, size: Tuple[int, int]) -> List[bytes]:
+    width, height = size
+    rng = np.random.default_rng(0)
+    payloads = []
+    for _ in range(count):
+        pixels = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+        buffer = io.BytesIO()
+        Image.fromarray(pixels, mode="RGB").save(buffer, format="JPEG", quality=90)
+        payloads.append(buffer.getvalue())
+    return payloads
+
+
+def _best(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", type=int, default=4)
+    parser.add_argument("--size", default="1600x1200")
+    parser.add_argument("--max-side", type=int, default=1024)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--phase3", action="store_true")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    width, height = (int(part) for part in args.size.lower().split("x"))
+    payloads = _synthetic_jpegs(args.images, (width, height))
+    names = [f"image {index}" for index in range(len(payloads))]
+    options = dict(max_side=args.max_side, enable_phase3=args.phase3, alpha=0.6, beta=0.6, blend=1.0)
+
+    def single(payload: bytes) -> None:
+        _compute_entry(
+            io.BytesIO(payload),
+            "single",
+            options["max_side"],
+            options["enable_phase3"],
+            options["alpha"],
+            options["beta"],
+            options["blend"],
+            "float32",
+        )
+
+    def serial() -> None:
+        for payload in payloads:
+            single(payload)
+
+    def pooled() -> None:
+        compute_comparison(
+            [io.BytesIO(payload) for payload in payloads],
+            names,
+            max_workers=args.workers,
+            **options,
+        )
+
+    # Warm-up so imports, detector loading and first-touch allocation are excluded.
+    single(payloads[0])
+    slowest = max(_best(lambda: single(payload), args.repeat) for payload in payloads)
+    serial_s = _best(serial, args.repeat)
+    pooled_s = _best(pooled, args.repeat)
+
+    workers = args.workers or min(len(payloads), os.cpu_count() or 1)
+    print(
+        f"{args.images} x {width}x{height} JPEG, max_side={args.max_side}, "
+        f"phase3={'on' if args.phase3 else 'off'}, {workers} workers, {os.cpu_count()} CPUs"
+    )
+    print(f"{'slowest image ms':>17}{'serial ms':>11}{'pooled ms':>11}{'overlap':>9}{'pooled/slowest':>16}")
+    print(
+        f"{slowest * 1000:>17.1f}{serial_s * 1000:>11.1f}{pooled_s * 1000:>11.1f}"
+        f"{serial_s / pooled_s:>9.2f}{pooled_s / slowest:>16.2f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Compare full-resolution JPEG decoding against the draft-mode loader.
+
+"full+resize" decodes every pixel and then shrinks to the same working size the
+loader produces, so "saved ms/MP" isolates the cost removed by DCT scaling.
+
+Usage:
+    python benchmarks/bench_decode.py [--max-side 1024] [--repeat 5] [image.jpg ...]
+
+Without image arguments, synthetic camera-sized JPEGs are generated in memory.
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+import numpy as np
+from PIL import Image
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from core_adapter.image_loader import load_image
+
+_SYNTHETIC_SIZES = [(2000, 1500), (4000, 3000), (6000, 4000)]
+
+
+def _synthetic_jpeg(size: Tuple[int, int]) -> Tuple[str, bytes]:
+    width, height = size
+    rng = np.random.default_rng(0)
+    ramp_x = np.linspace(0, 255, width, dtype=np.float32)[None, :]
+    ramp_y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+    noise = rng.normal(0.0, 4.0, size=(height, width)).astype(np.float32)
+    pixels = np.stack(
+        [ramp_x + noise, ramp_y + noise, (ramp_x + ramp_y) / 2 + noise],
+        axis=2,
+    )
+    image = Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8), mode="RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=90)
+    return f"synthetic {width}x{height}", buffer.getvalue()
+
+
+def _time(fn: Callable[[], Image.Image], repeat: int) -> Tuple[float, Tuple[int, int]]:
+    best = float("inf")
+    size = (0, 0)
+    for _ in range(repeat):
+        start = time.perf_counter()
+        image = fn()
+        image.load()
+        best = min(best, time.perf_counter() - start)
+        size = image.size
+    return best, size
+
+
+def _decode_then_resize(payload: bytes, max_side: int) -> Image.Image:
+    image = Image.open(io.BytesIO(payload)).convert("RGB")
+    scale = min(1.0, max_side / float(max(image.size)))
+    size = (max(1, round(image.size[0] * scale)), max(1, round(image.size[1] * scale)))
+    return image.resize(size, resample=Image.BILINEAR)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("images", nargs="*", type=Path)
+    parser.add_argument("--max-side", type=int, default=1024)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    inputs: List[Tuple[str, bytes]] = []
+    if args.images:
+        inputs = [(str(path), path.read_bytes()) for path in args.images]
+    else:
+        inputs = [_synthetic_jpeg(size) for size in _SYNTHETIC_SIZES]
+
+    print(
+        f"{'input':<28}{'MP':>6}{'full ms':>10}{'full+resize ms':>16}"
+        f"{'loader ms':>11}{'saved ms/MP':>13}  out size"
+    )
+    for label, payload in inputs:
+        with Image.open(io.BytesIO(payload)) as probe:
+            megapixels = probe.size[0] * probe.size[1] / 1e6
+
+        full_s, _ = _time(
+            lambda: Image.open(io.BytesIO(payload)).convert("RGB"), args.repeat
+        )
+        resized_s, _ = _time(
+            lambda: _decode_then_resize(payload, args.max_side), args.repeat
+        )
+        draft_s, out_size = _time(
+            lambda: load_image(io.BytesIO(payload), max_side=args.max_side), args.repeat
+        )
+        saved_per_mp = (resized_s - draft_s) * 1000.0 / megapixels
+        print(
+            f"{label[:27]:<28}{megapixels:>6.1f}{full_s * 1000:>10.1f}"
+            f"{resized_s * 1000:>16.1f}{draft_s * 1000:>11.1f}"
+            f"{saved_per_mp:>13.2f}  {out_size[0]}x{out_size[1]}"
+        )
+
+
+if __name__ == "__main__":
+    main()
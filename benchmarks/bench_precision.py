@@ -0,0 +1,118 @@
+"""Compare the float32 and reduced-precision Phase 3 paths.
+
+Per request this runs apply_hints and _prepare_heatmap on a synthetic frame
+and reports: bytes a caller keeps per request (the two hint maps and the
+final map, as in ComparisonEntry), time per request, peak RSS while holding
+--hold finished requests (as comparison mode does), and the largest absolute
+deviation of the reduced final map from the float32 one next to the bound
+from phase3.precision.max_final_deviation.
+
+Usage:
+    python benchmarks/bench_precision.py [--size 2048] [--requests 20] [--hold 8]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+for path in (ROOT, ROOT / "app"):
+    if str(path) not in sys.path:
+        sys.path.append(str(path))
+
+from phase3.precision import FULL, PRECISIONS, REDUCED, max_final_deviation, quantize_unit
+from phase3.runner import apply_hints
+from visualization import _prepare_heatmap
+
+_ALPHA, _BETA, _BLEND = 0.6, 0.6, 1.0
+
+
+def _inputs(size: int):
+    rng = np.random.default_rng(0)
+    yy, xx = np.mgrid[0:size, 0:size].astype(np.float32)
+    center = np.exp(-((yy - size / 2) ** 2 + (xx - size / 2) ** 2) / (2 * (size / 4) ** 2))
+    core = (0.8 * center + 0.2 * rng.random((size, size))).astype(np.float32)
+    face = np.exp(-((yy - size / 3) ** 2 + (xx - size / 3) ** 2) / (2 * (size / 20) ** 2))
+    text = np.exp(-((yy - size / 8) ** 2) / (2 * (size / 60) ** 2)) * np.ones_like(xx)
+    return core, face.astype(np.float32), text.astype(np.float32)
+
+
+def _hint_maps(precision: str, face, text):
+    # Fresh maps per call, as the detectors return for every request.
+    if precision == REDUCED:
+        return quantize_unit(face.copy()), quantize_unit(text.copy())
+    return face.copy(), text.copy()
+
+
+def _measure(precision: str, size: int, requests: int, hold: int) -> dict:
+    core, face, text = _inputs(size)
+    reference = apply_hints(core, face, text, _ALPHA, _BETA, _BLEND)
+
+    face_in, text_in = _hint_maps(precision, face, text)
+    final = apply_hints(core, face_in, text_in, _ALPHA, _BETA, _BLEND, precision=precision)
+    deviation = float(np.max(np.abs(final.astype(np.float32) - reference)))
+    kept_bytes = face_in.nbytes + text_in.nbytes + final.nbytes
+    del reference, final
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        final = apply_hints(core, face_in, text_in, _ALPHA, _BETA, _BLEND, precision=precision)
+        _prepare_heatmap(final, (size, size))
+    per_request = (time.perf_counter() - start) / requests
+
+    held = []
+    for _ in range(hold):
+        face_kept, text_kept = _hint_maps(precision, face, text)
+        final = apply_hints(core, face_kept, text_kept, _ALPHA, _BETA, _BLEND, precision=precision)
+        held.append((face_kept, text_kept, final))
+
+    return {
+        "precision": precision,
+        "kept_mb": kept_bytes / 1e6,
+        "ms": per_request * 1000.0,
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0,
+        "deviation": deviation,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=2048)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--hold", type=int, default=8)
+    parser.add_argument("--precision", choices=PRECISIONS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.precision:
+        print(json.dumps(_measure(args.precision, args.size, args.requests, args.hold)))
+        return
+
+    print(
+        f"{args.size}x{args.size}, alpha={_ALPHA} beta={_BETA} blend={_BLEND}, "
+        f"holding {args.hold} requests; deviation bound (core range 1) "
+        f"{max_final_deviation(_ALPHA, _BETA, _BLEND):.4f}"
+    )
+    print(f"{'mode':<9}{'kept MB/req':>13}{'ms/request':>12}{'peak RSS MB':>13}{'max |dev|':>11}")
+    for precision in (FULL, REDUCED):
+        # Separate processes so each mode's peak RSS is measured on its own.
+        output = subprocess.check_output(
+            [sys.executable, __file__, "--precision", precision, "--size", str(args.size),
+             "--requests", str(args.requests), "--hold", str(args.hold)],
+            text=True,
+        )
+        row = json.loads(output)
+        print(
+            f"{row['precision']:<9}{row['kept_mb']:>13.1f}{row['ms']:>12.1f}"
+            f"{row['max_rss_mb']:>13.1f}{row['deviation']:>11.5f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, List, Sequence
 
 import numpy as np
@@ -19,23 +19,32 @@ from core.fusion import fuse_features
 class AttentionResult:
     attention_map: np.ndarray
     feature_scores: Dict[str, float]
+    feature_maps: Dict[str, np.ndarray] = field(default_factory=dict)
 
 
-def run_attention(image: Image.Image) -> AttentionResult:
-    """Run the core visual attention pipeline on a PIL image."""
+def run_attention(image: Image.Image, keep_feature_maps: bool = False) -> AttentionResult:
+    """Run the core visual attention pipeline on a PIL image.
+
+    Per-feature maps are only kept on the result when keep_feature_maps is set,
+    since each one is a full frame.
+    """
     if image.mode != "RGB":
         image = image.convert("RGB")
 
     image_array = np.asarray(image).astype(np.float32)
-    return _run_feature_pipeline(image_array)
+    return _run_feature_pipeline(image_array, keep_feature_maps)
 
 
-def _run_feature_pipeline(image: np.ndarray) -> AttentionResult:
+def _run_feature_pipeline(image: np.ndarray, keep_feature_maps: bool = False) -> AttentionResult:
     features, feature_names, weights = _load_core_features()
     feature_maps = [feature(image) for feature in features]
     fused = fuse_features(features, image, weights=weights)
     feature_scores = _score_features(feature_maps, feature_names, weights)
-    return AttentionResult(attention_map=fused, feature_scores=feature_scores)
+    return AttentionResult(
+        attention_map=fused,
+        feature_scores=feature_scores,
+        feature_maps=dict(zip(feature_names, feature_maps)) if keep_feature_maps else {},
+    )
 
 
 def _load_core_features():
@@ -0,0 +1,47 @@
+"""Input loading helpers that avoid full-resolution decodes when possible."""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import BinaryIO, Optional, Union
+
+from PIL import Image, ImageOps
+
+ImageSource = Union[str, Path, BinaryIO]
+
+
+def load_image(source: ImageSource, max_side: Optional[int] = None) -> Image.Image:
+    """Open an image as RGB, upright, and no larger than max_side on its long edge.
+
+    For JPEG inputs the decoder is put into draft mode first, so libjpeg scales
+    by 1/2, 1/4 or 1/8 in the DCT domain instead of decoding every pixel and
+    resizing afterwards. Other formats are decoded normally and then resized.
+    If max_side is None the image is returned at full resolution.
+    """
+    image = Image.open(source)
+    if max_side is not None:
+        max_side = int(max_side)
+        if max_side <= 0:
+            raise ValueError("max_side must be a positive integer")
+        _apply_draft(image, max_side)
+
+    ImageOps.exif_transpose(image, in_place=True)
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+
+    if max_side is not None and max(image.size) > max_side:
+        image.thumbnail((max_side, max_side), resample=Image.BILINEAR)
+    return image
+
+
+def _apply_draft(image: Image.Image, max_side: int) -> None:
+    # Draft mode only configures the decoder; pixels are read on first access.
+    # Draft never reduces below the requested size, and an EXIF rotation only
+    # swaps the axes, so the long edge stays >= max_side for the final resize.
+    if image.format != "JPEG":
+        return
+    width, height = image.size
+    scale = max_side / float(max(width, height))
+    if scale >= 1.0:
+        return
+    requested = (max(1, int(width * scale)), max(1, int(height * scale)))
+    image.draft("RGB", requested)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import io
+
+from PIL import Image
+
+from core_adapter.image_loader import _apply_draft, load_image
+
+
+def _assert(condition: bool, message: str) -> None:
+    if not condition:
+        raise AssertionError(message)
+
+
+def _encode(image: Image.Image, fmt: str, **params) -> io.BytesIO:
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt, **params)
+    buffer.seek(0)
+    return buffer
+
+
+def test_exif_orientation_is_applied() -> None:
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Rotate 90 degrees clockwise to display upright.
+    source = _encode(Image.new("RGB", (40, 20), (200, 10, 10)), "JPEG", exif=exif.tobytes())
+    image = load_image(source)
+    _assert(image.size == (20, 40), "EXIF orientation 6 must swap width and height.")
+    _assert(image.getexif().get(0x0112, 1) == 1, "Orientation tag must be cleared after rotating.")
+
+
+def test_draft_mode_decodes_jpeg_at_reduced_scale() -> None:
+    source = _encode(Image.new("RGB", (4000, 3000), (30, 90, 160)), "JPEG")
+    with Image.open(source) as opened:
+        _apply_draft(opened, 1000)
+        _assert(opened.size == (1000, 750), "Draft mode must decode at 1/4 scale.")
+
+    source.seek(0)
+    image = load_image(source, max_side=1000)
+    _assert(image.size == (1000, 750), "Long edge must match max_side.")
+    source.seek(0)
+    _assert(load_image(source).size == (4000, 3000), "max_side=None keeps full resolution.")
+
+
+def test_modes_are_converted_to_rgb() -> None:
+    gray = load_image(_encode(Image.new("L", (64, 48), 128), "JPEG"))
+    rgba = load_image(_encode(Image.new("RGBA", (64, 48), (10, 20, 30, 128)), "PNG"), max_side=32)
+    _assert(gray.mode == "RGB" and gray.size == (64, 48), "Grayscale JPEG must load as RGB.")
+    _assert(rgba.mode == "RGB" and rgba.size == (32, 24), "RGBA PNG must load as resized RGB.")
+
+
+def test_invalid_max_side_is_rejected() -> None:
+    try:
+        load_image(_encode(Image.new("RGB", (8, 8)), "PNG"), max_side=0)
+    except ValueError:
+        return
+    raise AssertionError("max_side <= 0 must raise ValueError.")
+
+
+def run_smoke_tests() -> None:
+    test_exif_orientation_is_applied()
+    test_draft_mode_decodes_jpeg_at_reduced_scale()
+    test_modes_are_converted_to_rgb()
+    test_invalid_max_side_is_rejected()
+    print("Image loader smoke tests passed.")
+
+
+if __name__ == "__main__":
+    run_smoke_tests()
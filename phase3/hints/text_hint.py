@@ -6,9 +6,15 @@ import os
 
 import numpy as np
 
+from phase3.precision import finish_hint, to_uint8_gray
+from phase3.workspace import get_workspace
 
-def build_text_hint_map(image: np.ndarray) -> np.ndarray:
-    """Return a soft text-prior mask in [0, 1] with shape (H, W)."""
+
+def build_text_hint_map(image: np.ndarray, dtype=np.float32) -> np.ndarray:
+    """Return a soft text-prior mask in [0, 1] with shape (H, W).
+
+    With dtype=np.uint8 the mask is stored scaled to 0..255 instead.
+    """
     if image.ndim not in (2, 3):
         raise ValueError("image must be a 2D or 3D array")
 
@@ -21,14 +27,15 @@ def build_text_hint_map(image: np.ndarray) -> np.ndarray:
 
     height, width = image.shape[:2]
     if height == 0 or width == 0:
-        return np.zeros((height, width), dtype=np.float32)
+        return np.zeros((height, width), dtype=dtype)
 
-    gray = _to_uint8_gray(image, cv2)
+    gray = to_uint8_gray(image, cv2)
     boxes = _detect_text_regions(gray, cv2)
     if not boxes:
-        return np.zeros((height, width), dtype=np.float32)
+        return np.zeros((height, width), dtype=dtype)
 
-    mask = np.zeros((height, width), dtype=np.float32)
+    workspace = get_workspace()
+    mask = workspace.zeros("hint.mask", (height, width))
     for x0, y0, x1, y1 in boxes:
         x0 = max(0, int(x0))
         y0 = max(0, int(y0))
@@ -38,8 +45,14 @@ def build_text_hint_map(image: np.ndarray) -> np.ndarray:
             mask[y0:y1, x0:x1] = 1.0
 
     sigma = max(1.0, min(height, width) * 0.02)
-    blurred = cv2.GaussianBlur(mask, ksize=(0, 0), sigmaX=sigma, sigmaY=sigma)
-    return _normalize(blurred)
+    blurred = cv2.GaussianBlur(
+        mask,
+        ksize=(0, 0),
+        sigmaX=sigma,
+        dst=workspace.buffer("hint.blurred", (height, width)),
+        sigmaY=sigma,
+    )
+    return finish_hint(blurred, dtype)
 
 
 def _detect_text_regions(gray: np.ndarray, cv2_module) -> List[Tuple[int, int, int, int]]:
@@ -180,29 +193,3 @@ def _detect_text_heuristic(
             continue
         boxes.append((x, y, x + w, y + h))
     return boxes
-
-
-def _to_uint8_gray(image: np.ndarray, cv2_module) -> np.ndarray:
-    if image.ndim == 2:
-        gray = image
-    else:
-        if image.shape[2] >= 3:
-            gray = cv2_module.cvtColor(image, cv2_module.COLOR_RGB2GRAY)
-        else:
-            gray = image[..., 0]
-
-    gray = np.asarray(gray, dtype=np.float32)
-    max_val = float(np.max(gray)) if gray.size else 0.0
-    if max_val <= 1.0:
-        gray = gray * 255.0
-    gray = np.clip(gray, 0.0, 255.0)
-    return gray.astype(np.uint8)
-
-
-def _normalize(mask: np.ndarray, eps: float = 1e-6) -> np.ndarray:
-    min_val = float(np.min(mask))
-    max_val = float(np.max(mask))
-    if max_val - min_val < eps:
-        return np.zeros_like(mask, dtype=np.float32)
-    normalized = (mask - min_val) / (max_val - min_val)
-    return np.clip(normalized, 0.0, 1.0).astype(np.float32)
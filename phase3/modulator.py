@@ -4,23 +4,36 @@ from typing import Optional
 
 import numpy as np
 
+from phase3.workspace import Workspace, normalize
+
 
 def modulate_attention(
     core_attention_map: np.ndarray,
     face_hint_map: Optional[np.ndarray] = None,
     alpha: float = 0.6,
     blend: float = 1.0,
+    out: Optional[np.ndarray] = None,
+    workspace: Optional[Workspace] = None,
 ) -> np.ndarray:
     """Apply a simple, explainable face prior to the core attention map.
 
     If no face_hint_map is provided, the output equals core_attention_map.
+    The result is written into out when given (a float32 array of the same
+    shape); workspace supplies the clipped-core scratch buffer so repeated
+    calls allocate nothing. Inputs are never modified.
     """
     core = np.asarray(core_attention_map, dtype=np.float32)
     if core.ndim != 2:
         raise ValueError("core_attention_map must be a 2D (H, W) array")
 
+    if out is not None and (out.shape != core.shape or out.dtype != np.float32):
+        raise ValueError("out must be a float32 array matching core_attention_map")
+
     if face_hint_map is None:
-        return core
+        if out is None:
+            return core
+        np.copyto(out, core)
+        return out
 
     hint = np.asarray(face_hint_map, dtype=np.float32)
     if hint.shape != core.shape:
@@ -29,24 +42,26 @@ def modulate_attention(
     alpha = max(0.0, float(alpha))
     blend = float(np.clip(blend, 0.0, 1.0))
 
-    core = np.clip(core, 0.0, 1.0)
-    hint = np.clip(hint, 0.0, 1.0)
+    if workspace is None:
+        clipped_core = np.empty(core.shape, dtype=np.float32)
+    else:
+        clipped_core = workspace.buffer("modulate.core", core.shape)
+    np.clip(core, 0.0, 1.0, out=clipped_core)
 
-    multiplier = 1.0 + alpha * hint
-    modulated = core * multiplier
-    modulated = np.clip(modulated, 0.0, 1.0 + alpha)
+    # out = normalize(core * (1 + alpha * hint)), built up in a single buffer.
+    if out is None:
+        out = np.empty(core.shape, dtype=np.float32)
+    np.clip(hint, 0.0, 1.0, out=out)
+    out *= alpha
+    out += 1.0
+    out *= clipped_core
+    np.clip(out, 0.0, 1.0 + alpha, out=out)
 
-    normalized = _normalize(modulated)
+    normalize(out, out=out)
     if blend >= 1.0:
-        return normalized
-
-    return (1.0 - blend) * core + blend * normalized
-
+        return out
 
-def _normalize(attention_map: np.ndarray, eps: float = 1e-6) -> np.ndarray:
-    min_val = float(np.min(attention_map))
-    max_val = float(np.max(attention_map))
-    if max_val - min_val < eps:
-        return np.zeros_like(attention_map, dtype=np.float32)
-    normalized = (attention_map - min_val) / (max_val - min_val)
-    return np.clip(normalized, 0.0, 1.0)
+    out *= blend
+    clipped_core *= 1.0 - blend
+    out += clipped_core
+    return out
@@ -0,0 +1,108 @@
+"""Storage dtypes for the opt-in reduced-precision Phase 3 path.
+
+In "reduced" mode hint maps are stored as uint8 (value * 255) and the final
+attention map as float16. Every arithmetic step still accumulates in float32
+workspace buffers; only the arrays handed between stages shrink. The 8-bit
+detector input shared by both paths is built here too, so they cannot drift.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+from phase3.workspace import normalize
+
+FULL = "float32"
+REDUCED = "reduced"
+PRECISIONS = (FULL, REDUCED)
+
+# Worst-case absolute error of one uint8 hint map and of a float16 value in [0, 1].
+HINT_QUANTIZATION_ERROR = 0.5 / 255.0
+FLOAT16_ROUNDING_ERROR = 2.0 ** -12
+
+
+def check_precision(precision: str) -> str:
+    if precision not in PRECISIONS:
+        raise ValueError(f"precision must be one of {PRECISIONS}, got {precision!r}")
+    return precision
+
+
+def hint_scale(hint_map: np.ndarray) -> float:
+    """Return the factor that maps stored hint values back onto [0, 1]."""
+    return 1.0 / 255.0 if hint_map.dtype == np.uint8 else 1.0
+
+
+def quantize_unit(values: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Store a [0, 1] float map as uint8, rounding to the nearest step.
+
+    values is used as scratch and is left scaled by 255.
+    """
+    if out is None:
+        out = np.empty(values.shape, dtype=np.uint8)
+    values *= 255.0
+    np.rint(values, out=values)
+    np.copyto(out, values, casting="unsafe")
+    return out
+
+
+def finish_hint(blurred: np.ndarray, dtype=np.float32) -> np.ndarray:
+    """Normalize a blurred hint mask into a fresh map of the requested dtype.
+
+    For uint8 the mask (a workspace buffer) is normalized in place and only
+    the quantized copy is allocated.
+    """
+    if np.dtype(dtype) == np.uint8:
+        return quantize_unit(normalize(blurred, out=blurred))
+    return normalize(blurred)
+
+
+def to_uint8(image: np.ndarray) -> np.ndarray:
+    """Return image as uint8 pixels, rounding float input ([0, 1] or [0, 255])."""
+    if image.dtype == np.uint8 and (image.size == 0 or int(np.max(image)) > 1):
+        # Already 8-bit (reduced-precision callers pass the raw image).
+        return image
+
+    pixels = np.asarray(image, dtype=np.float32)
+    max_val = float(np.max(pixels)) if pixels.size else 0.0
+    if max_val <= 1.0:
+        pixels = pixels * 255.0
+    pixels = np.clip(pixels, 0.0, 255.0)
+    return np.rint(pixels).astype(np.uint8)
+
+
+def to_uint8_gray(image: np.ndarray, cv2_module) -> np.ndarray:
+    """Return the 8-bit grayscale image the OpenCV hint detectors run on.
+
+    Pixels are quantized before the color conversion so float32 and uint8
+    copies of the same picture give the same gray image.
+    """
+    pixels = to_uint8(image)
+    if pixels.ndim == 2:
+        return pixels
+    if pixels.shape[2] >= 3:
+        return cv2_module.cvtColor(pixels, cv2_module.COLOR_RGB2GRAY)
+    return pixels[..., 0]
+
+
+def max_final_deviation(
+    alpha: float,
+    beta: float,
+    blend: float = 1.0,
+    modulated_range: float = 1.0,
+) -> float:
+    """Upper bound on |reduced - float32| for one pixel of the final map.
+
+    Quantizing the two hints moves the combined hint, and therefore
+    core * (1 + hint) with core clipped to [0, 1], by at most
+    d = (alpha + beta) * HINT_QUANTIZATION_ERROR. Min-max normalization over a
+    modulated range R turns that into about 4 * d / R (to first order), the
+    blend scales it, and float16 storage adds one rounding step.
+    modulated_range is R, the max - min of core * (1 + hint) before
+    normalization.
+    """
+    hint_error = (max(0.0, alpha) + max(0.0, beta)) * HINT_QUANTIZATION_ERROR
+    blend = float(np.clip(blend, 0.0, 1.0))
+    if modulated_range <= 0.0:
+        return float("inf")
+    return blend * 4.0 * hint_error / modulated_range + FLOAT16_ROUNDING_ERROR
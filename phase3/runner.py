@@ -1,12 +1,15 @@
 from __future__ import annotations
 
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
 import numpy as np
+from PIL import Image
 
 from phase3.hints.face_hint import build_face_hint_map
 from phase3.hints.text_hint import build_text_hint_map
 from phase3.modulator import modulate_attention
+from phase3.precision import FULL, REDUCED, check_precision, hint_scale
+from phase3.workspace import get_workspace
 
 
 def run_phase3(
@@ -15,17 +18,84 @@ def run_phase3(
     alpha: float,
     beta: float,
     blend: float,
+    precision: str = FULL,
 ) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
-    """Run Phase 3 hint generation and modulation."""
-    face_hint = build_face_hint_map(image)
-    text_hint = build_text_hint_map(image)
+    """Run Phase 3 hint generation and modulation.
 
-    combined_hint = np.clip(alpha * face_hint + beta * text_hint, 0.0, 1.0)
-    final_attention = modulate_attention(
+    precision="reduced" returns uint8 hint maps and a float16 final map; see
+    phase3.precision for the deviation bound against the float32 path.
+    """
+    check_precision(precision)
+    hint_dtype = np.uint8 if precision == REDUCED else np.float32
+    face_hint = build_face_hint_map(image, dtype=hint_dtype)
+    text_hint = build_text_hint_map(image, dtype=hint_dtype)
+
+    final_attention = apply_hints(
+        core_attention_map, face_hint, text_hint, alpha, beta, blend, precision=precision
+    )
+    return final_attention, {"face": face_hint, "text": text_hint}
+
+
+def phase3_input(image: Image.Image, precision: str = FULL) -> np.ndarray:
+    """Return the array form of a PIL image that run_phase3 expects.
+
+    The hint detectors work on 8-bit grayscale, so reduced precision hands
+    them the uint8 pixels directly instead of a float32 copy four times larger.
+    """
+    if check_precision(precision) == REDUCED:
+        return np.asarray(image)
+    return np.asarray(image, dtype=np.float32)
+
+
+def apply_hints(
+    core_attention_map: np.ndarray,
+    face_hint: np.ndarray,
+    text_hint: np.ndarray,
+    alpha: float,
+    beta: float,
+    blend: float,
+    out: Optional[np.ndarray] = None,
+    precision: str = FULL,
+) -> np.ndarray:
+    """Modulate the core map with precomputed hint maps.
+
+    Hint maps do not depend on alpha/beta/blend, so sweeps can build them once
+    and call this for every setting. The combined hint lives in the thread's
+    workspace; only the returned map (or out) is fresh memory. Hints may be
+    float or uint8 (0..255); they are always combined in float32.
+    """
+    check_precision(precision)
+    workspace = get_workspace()
+    combined_hint = workspace.buffer("phase3.combined_hint", np.shape(face_hint))
+    scaled_text = workspace.buffer("phase3.scaled_text", np.shape(text_hint))
+    # float32 scalars keep uint8 hints on a float32 loop instead of float64.
+    face_weight = np.float32(alpha * hint_scale(face_hint))
+    text_weight = np.float32(beta * hint_scale(text_hint))
+    np.multiply(face_hint, face_weight, out=combined_hint, casting="unsafe")
+    np.multiply(text_hint, text_weight, out=scaled_text, casting="unsafe")
+    combined_hint += scaled_text
+    np.clip(combined_hint, 0.0, 1.0, out=combined_hint)
+
+    if precision == FULL:
+        return modulate_attention(
+            core_attention_map,
+            face_hint_map=combined_hint,
+            alpha=1.0,
+            blend=blend,
+            out=out,
+            workspace=workspace,
+        )
+
+    # Accumulate in float32 scratch, then store the result as float16.
+    final32 = modulate_attention(
         core_attention_map,
         face_hint_map=combined_hint,
         alpha=1.0,
         blend=blend,
+        out=workspace.buffer("phase3.final32", np.shape(combined_hint)),
+        workspace=workspace,
     )
-
-    return final_attention, {"face": face_hint, "text": text_hint}
+    if out is None:
+        out = np.empty(final32.shape, dtype=np.float16)
+    np.copyto(out, final32, casting="same_kind")
+    return out
@@ -3,6 +3,9 @@ from __future__ import annotations
 import numpy as np
 
 from phase3.modulator import modulate_attention
+from phase3.precision import max_final_deviation, quantize_unit, to_uint8
+from phase3.runner import apply_hints, run_phase3
+from phase3.workspace import Workspace
 
 
 def _assert(condition: bool, message: str) -> None:
@@ -32,10 +35,101 @@ def test_output_range_and_dtype() -> None:
     _assert(np.max(output) <= 1.0, "Output must be <= 1.")
 
 
+def test_out_buffer_matches_allocating_path() -> None:
+    core = np.random.rand(4, 4).astype(np.float32)
+    hint = (np.random.rand(4, 4) > 0.5).astype(np.float32)
+    core_before, hint_before = core.copy(), hint.copy()
+    expected = modulate_attention(core, face_hint_map=hint, alpha=1.2, blend=0.7)
+    out = np.empty_like(core)
+    output = modulate_attention(
+        core, face_hint_map=hint, alpha=1.2, blend=0.7, out=out, workspace=Workspace()
+    )
+    _assert(output is out, "Result should be written into out.")
+    _assert(np.array_equal(expected, output), "out= path must match the allocating path.")
+    _assert(np.array_equal(core, core_before), "Core map must not be modified.")
+    _assert(np.array_equal(hint, hint_before), "Hint map must not be modified.")
+
+
+def test_workspace_stays_under_byte_cap() -> None:
+    workspace = Workspace(max_bytes=64 * 1024)
+    for size in range(16, 90, 3):
+        workspace.buffer("scratch", (size, size))
+        workspace.buffer("rgb", (size, size, 3), np.uint8)
+        _assert(workspace.nbytes <= 64 * 1024, "Workspace must stay under its byte cap.")
+    first = workspace.buffer("scratch", (20, 20))
+    _assert(workspace.buffer("scratch", (20, 20)) is first, "Same key must reuse its buffer.")
+    workspace.clear()
+    _assert(workspace.nbytes == 0, "clear() must release every buffer.")
+
+
+def test_reduced_precision_within_bound() -> None:
+    yy, xx = np.mgrid[0:32, 0:32].astype(np.float32)
+    core = np.random.rand(32, 32).astype(np.float32)
+    core[0, 0], core[0, 1] = 0.0, 1.0
+    face = np.exp(-((yy - 10) ** 2 + (xx - 12) ** 2) / 50.0).astype(np.float32)
+    text = np.exp(-((yy - 25) ** 2) / 8.0).astype(np.float32) * np.ones_like(xx)
+    full = apply_hints(core, face, text, 0.6, 0.6, 1.0)
+    reduced = apply_hints(
+        core, quantize_unit(face.copy()), quantize_unit(text.copy()), 0.6, 0.6, 1.0,
+        precision="reduced",
+    )
+    modulated = core * (1.0 + np.clip(0.6 * face + 0.6 * text, 0.0, 1.0))
+    bound = max_final_deviation(0.6, 0.6, 1.0, float(modulated.max() - modulated.min()))
+    deviation = float(np.max(np.abs(reduced.astype(np.float32) - full)))
+    _assert(reduced.dtype == np.float16, "Reduced output must be float16.")
+    _assert(deviation <= bound, "Reduced output must stay within the documented bound.")
+
+
+def _poster(size: int = 96) -> np.ndarray:
+    image = np.full((size, size, 3), 235, dtype=np.uint8)
+    for row in range(10, 40, 8):
+        image[row:row + 4, 12:84] = (20, 30, 40)
+    yy, xx = np.mgrid[0:size, 0:size]
+    image[(yy - 68) ** 2 + (xx - 48) ** 2 < 200] = (190, 140, 120)
+    return image
+
+
+def test_detectors_see_same_pixels_for_both_precisions() -> None:
+    image = _poster()
+    _assert(
+        np.array_equal(to_uint8(image.astype(np.float32)), to_uint8(image)),
+        "float32 and uint8 inputs must quantize to the same pixels.",
+    )
+    scaled = to_uint8(image.astype(np.float32) / 255.0)
+    _assert(np.array_equal(scaled, image), "[0, 1] inputs must round, not truncate.")
+
+
+def test_run_phase3_reduced_within_bound() -> None:
+    try:
+        import cv2  # noqa: F401
+    except ImportError:
+        print("OpenCV not installed; skipping run_phase3 precision check.")
+        return
+
+    image = _poster()
+    core = np.random.rand(96, 96).astype(np.float32)
+    core[0, 0], core[0, 1] = 0.0, 1.0
+    full, full_hints = run_phase3(image.astype(np.float32), core, 0.6, 0.6, 1.0)
+    reduced, reduced_hints = run_phase3(image, core, 0.6, 0.6, 1.0, precision="reduced")
+    for name in ("face", "text"):
+        error = np.abs(reduced_hints[name] / 255.0 - full_hints[name])
+        _assert(float(np.max(error)) <= 0.5 / 255.0 + 1e-6, f"{name} hint must differ by quantization only.")
+    hint = np.clip(0.6 * full_hints["face"] + 0.6 * full_hints["text"], 0.0, 1.0)
+    modulated = core * (1.0 + hint)
+    bound = max_final_deviation(0.6, 0.6, 1.0, float(modulated.max() - modulated.min()))
+    deviation = float(np.max(np.abs(reduced.astype(np.float32) - full)))
+    _assert(deviation <= bound, "run_phase3 reduced output must stay within the bound.")
+
+
 def run_smoke_tests() -> None:
     test_no_hints_passthrough()
     test_face_hint_increases_attention()
     test_output_range_and_dtype()
+    test_out_buffer_matches_allocating_path()
+    test_workspace_stays_under_byte_cap()
+    test_reduced_precision_within_bound()
+    test_detectors_see_same_pixels_for_both_precisions()
+    test_run_phase3_reduced_within_bound()
     print("Phase 3 smoke tests passed.")
 
 
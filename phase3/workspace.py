@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import numpy as np
+
+_local = threading.local()
+
+# Enough for one 2048x2048 request (modulation, hints and heatmap) to stay
+# resident; larger frames still work but some buffers are reallocated.
+DEFAULT_MAX_BYTES = 256 * 2 ** 20
+
+
+class Workspace:
+    """Named scratch buffers reused across requests of the same image shape.
+
+    Buffers are only for intermediates: anything returned to a caller must be
+    a fresh array or a caller-supplied out=, because the next request on the
+    same worker overwrites the workspace.
+
+    Retained memory is capped at max_bytes: once over the cap the least
+    recently used buffers are dropped, so a worker that sees many image sizes
+    does not keep one set of buffers per size. Reuse only pays off on
+    long-lived threads; a thread that serves a single request (a per-call
+    pool, or a fresh Streamlit script thread) gains nothing. The trade is less
+    allocation churn for more resident memory: every thread keeps its own
+    working set between requests, so peak RSS is higher than allocating
+    temporaries per request (see benchmarks/bench_allocations.py).
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._buffers: "OrderedDict[Tuple[str, Tuple[int, ...], str], np.ndarray]" = OrderedDict()
+        self._nbytes = 0
+
+    def buffer(
+        self,
+        name: str,
+        shape: Tuple[int, ...],
+        dtype: np.dtype = np.float32,
+    ) -> np.ndarray:
+        """Return an uninitialized buffer, allocating it on first use."""
+        key = (name, tuple(shape), np.dtype(dtype).str)
+        array = self._buffers.get(key)
+        if array is not None:
+            self._buffers.move_to_end(key)
+            return array
+        array = np.empty(shape, dtype=dtype)
+        self._buffers[key] = array
+        self._nbytes += array.nbytes
+        # Evict oldest first; the buffer just handed out is always kept.
+        while self._nbytes > self.max_bytes and len(self._buffers) > 1:
+            _, evicted = self._buffers.popitem(last=False)
+            self._nbytes -= evicted.nbytes
+        return array
+
+    def zeros(
+        self,
+        name: str,
+        shape: Tuple[int, ...],
+        dtype: np.dtype = np.float32,
+    ) -> np.ndarray:
+        """Return a zero-filled buffer."""
+        array = self.buffer(name, shape, dtype)
+        array.fill(0)
+        return array
+
+    def clear(self) -> None:
+        self._buffers.clear()
+        self._nbytes = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+
+def get_workspace() -> Workspace:
+    """Return the calling thread's workspace, creating it on first use."""
+    workspace = getattr(_local, "workspace", None)
+    if workspace is None:
+        workspace = Workspace()
+        _local.workspace = workspace
+    return workspace
+
+
+def normalize(
+    values: np.ndarray,
+    eps: float = 1e-6,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Min-max scale values into [0, 1] as float32.
+
+    Pass out (which may be values itself) to write the result in place.
+    A flat input normalizes to all zeros.
+    """
+    if out is None:
+        out = np.empty(values.shape, dtype=np.float32)
+    min_val = float(np.min(values))
+    max_val = float(np.max(values))
+    if max_val - min_val < eps:
+        out.fill(0.0)
+        return out
+    np.subtract(values, min_val, out=out, casting="unsafe")
+    np.divide(out, max_val - min_val, out=out)
+    return np.clip(out, 0.0, 1.0, out=out)